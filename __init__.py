@@ -1,4 +1,7 @@
+import multiprocessing
+
 from components.helix import Helix
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     Helix().run()
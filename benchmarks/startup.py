@@ -0,0 +1,58 @@
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 10
+SAMPLES = ("y = sin(x)^2 + cos(x)", "z = exp(-(x^2 + y^2))", "f(x) = x^3 - 2*x", "a = 2")
+
+PRELUDE = """
+import sys, json, time
+sys.path.insert(0, %r)
+start = time.perf_counter()
+import sympy
+imported = time.perf_counter() - start
+""" % ROOT
+
+EAGER = PRELUDE + """
+start = time.perf_counter()
+namespace = {}
+exec('from sympy.core import *', namespace)
+exec('from sympy.functions import *', namespace)
+exec('from sympy.integrals import *', namespace)
+for e in ('sympify', 'SympifyError', 'Subs', 'evalf', 'evaluate'): namespace.pop(e, None)
+namespace_time = time.perf_counter() - start
+print(json.dumps({ "import" : imported, "construction" : namespace_time,
+    "namespace" : namespace_time, "loaded" : len(namespace) }))
+"""
+
+LAZY = PRELUDE + """
+from utils.parsing import Parser, Parsed
+parser = Parser()
+for text in %r: Parsed.evaluate(text, False)
+stats = parser.get_startup_stats()
+print(json.dumps({ "import" : imported, "construction" : stats["construction"],
+    "namespace" : stats["resolution"], "loaded" : stats["loaded"] }))
+""" % (SAMPLES,)
+
+def measure(code):
+    runs = []
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, "-c", code], check = True,
+            capture_output = True, text = True, cwd = ROOT).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return dict((k, statistics.median(r[k] for r in runs)) for k in runs[0].keys())
+
+def main():
+    print("Parser namespace startup, median of %d fresh processes" % RUNS)
+    print("%-8s %12s %16s %16s %8s" % ("", "import (ms)", "parser (ms)", "namespace (ms)",
+        "names"))
+    for (name, code) in (("eager", EAGER), ("lazy", LAZY)):
+        r = measure(code)
+        print("%-8s %12.1f %16.3f %16.3f %8d" % (name, r["import"] * 1000,
+            r["construction"] * 1000, r["namespace"] * 1000, r["loaded"]))
+
+if __name__ == "__main__":
+    main()
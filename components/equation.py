@@ -76,6 +76,7 @@ class Equation(tk.Frame):
     HIDE_KEY = "hidden"
     CONTOUR_KEY = "contoured"
     PARAMETRIC_KEY = "pl_"
+    PARSE_POLL = 50
 
     __counter = 0
 
@@ -90,13 +91,16 @@ class Equation(tk.Frame):
 
         self.__debounce_update_id = None
         self.__debounce_replot_id = None
+        self.__pending_id = None
         self.__debounce_delay = 500
+        self.__restoring = False
 
         self.div = None
 
         self.__plottable = False
         self.__cancel_plot = False
         self.__parsed = Parsed("")
+        self.__pending = None
 
         self.__min_height = 38
         self.__button_size = 24
@@ -125,6 +129,8 @@ class Equation(tk.Frame):
         self.__readout_active = False
         self.__readout_height = 32 + 2 * self.__spacing
         self.__readout_type = EquationLabelType.NONE
+        self.__readout_text = None
+        self.__report = None
         self.__readout = tk.Label(self.__content_wrapper,
             bg = theme.get_body_colour(),
             image = ImageManager.get_instance().get_image(
@@ -288,6 +294,7 @@ class Equation(tk.Frame):
         if bool(settings.get(Equation.CONTOUR_KEY, False)): contour()
     def __construct_remove(self):
         def remove(self):
+            self.cancel_updates()
             self.pack_forget()
             self.__remove_func(self)
         self.__remove_button = self.__create_button(lambda s = self : remove(s), "remove")
@@ -333,6 +340,7 @@ class Equation(tk.Frame):
         return settings
 
     def __debounce_update(self, *_args):
+        if self.__restoring: return
         if self.__debounce_update_id is not None:
             DelayTracker.get_instance().end_delay(self, self.__debounce_update_id)
         self.__debounce_update_id = self.after(self.__debounce_delay, self.__update)
@@ -355,27 +363,74 @@ class Equation(tk.Frame):
                 self.__cancel_plot = True
                 break
         self.__parsed.set_colour((self.__r / 255.0, self.__g / 255.0, self.__b / 255.0))
-    def update(self):
-        self.__update(callback = False)
-    def __update(self, *_args, callback = True):
+    def update(self, callback):
+        self.__update(callback = callback)
+    def __update(self, *_args, callback = None):
         DelayTracker.get_instance().remove_delay(self, self.__debounce_update_id)
         self.__debounce_update_id = None
-        self.__parsed = Parsed(self.get_text())
+        self.__cancel_parse()
+        self.__pending = Parsed(self.get_text(), blocking = False)
+        self.__await_parse(self.__update_func if callback is None else callback)
+    def __await_parse(self, callback):
+        DelayTracker.get_instance().remove_delay(self, self.__pending_id)
+        self.__pending_id = None
+        if self.__pending.is_pending():
+            self.__pending_id = self.after(Equation.PARSE_POLL,
+                lambda : self.__await_parse(callback))
+            DelayTracker.get_instance().add_delay(self, self.__pending_id)
+            return
+        self.__parsed, self.__pending = self.__pending, None
         self.__parsed.set_equation(self)
+        self.__report = None
         self.__generic_updates()
-        if callback: self.__update_func(self)
+        callback(self)
+    def __cancel_parse(self):
+        if self.__pending_id is not None:
+            DelayTracker.get_instance().end_delay(self, self.__pending_id)
+        self.__pending_id = None
+        self.__pending = None
     def __replot(self, *_args):
         self.__generic_updates()
         self.__replot_func()
     def set_width(self, w):
         self.__inner.configure(width = w)
 
+    def get_snapshot(self):
+        return (self.get_text(), self.__parsed, self.__parsed.get_result(),
+            self.__readout_type, self.__readout_text, self.__report)
+    def cancel_updates(self):
+        if self.__debounce_update_id is not None:
+            DelayTracker.get_instance().end_delay(self, self.__debounce_update_id)
+            self.__debounce_update_id = None
+        self.__cancel_parse()
+    def restore_snapshot(self, snapshot):
+        if self.get_snapshot() == snapshot: return
+        self.cancel_updates()
+        text, self.__parsed, result, self.__readout_type, self.__readout_text, self.__report \
+            = snapshot
+        if self.get_text() != text:
+            self.__restoring = True
+            self.__entry_var.set(text)
+            self.__restoring = False
+        self.__parsed.set_result(result)
+        self.__generic_updates()
+        self.__set_tooltip()
+
     def label(self, t = None, text = None):
         if any(map(lambda t : t is None, (t, text))):
             self.label(EquationLabelType.VALUE, str(self.__parsed.get_binding()))
         else:
             self.__readout_type = t
-            self.__readout_tooltip.set_text(text)
+            self.__readout_text = text
+            self.__set_tooltip()
+    def report(self, text = None):
+        self.__report = text
+        self.__set_tooltip()
+    def __set_tooltip(self):
+        text = self.__readout_text
+        if self.__report is not None and self.__readout_type is EquationLabelType.VALUE:
+            text = str(text) + "\n" + self.__report
+        self.__readout_tooltip.set_text(text)
 
     def __place_buttons(self):
         buttons = []
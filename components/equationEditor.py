@@ -3,6 +3,8 @@ import ast
 import tkinter as tk
 
 from utils.theme import Theme
+from utils.graph import DependencyGraph
+from utils.delay import DelayTracker
 from utils.parsing import Parser
 
 from components.equation import Equation, EquationLabelType
@@ -27,6 +29,9 @@ class EquationDivider(tk.Frame):
 class EquationEditor(ScrollableFrame):
 
     EQUATION_KEY = "eq"
+    UNBOUND = [None, Parser.X, Parser.Y, Parser.Z]
+    HISTORY_SIZE = 64
+    BINDING_POLL = 50
 
     def __init__(self, parent, width, plotter, change_func):
         super().__init__(parent, self.__entry_config)
@@ -45,6 +50,13 @@ class EquationEditor(ScrollableFrame):
         self.__plots = []
         self.__raw_plots = []
         self.__bindings = []
+        self.__parameters = {}
+        self.__graph = DependencyGraph()
+        self.__history = []
+        self.__history_index = -1
+        self.__loading = set()
+        self.__pending = []
+        self.__pending_id = None
 
         self.__add_button_height = 0.05
 
@@ -65,8 +77,17 @@ class EquationEditor(ScrollableFrame):
         for k in settings.keys():
             if isinstance(k, str) and k.startswith(EquationEditor.EQUATION_KEY):
                 self.__add_entry(ast.literal_eval(settings[k]))
-        for e in self.__entries: e.update()
+        self.__loading = set(self.__entries)
+        for e in list(self.__entries): e.update(self.__load_entry)
+        if len(self.__entries) == 0: self.__finish_loading()
+    def __load_entry(self, entry):
+        if entry not in self.__loading: return
+        self.__loading.discard(entry)
+        if len(self.__loading) == 0: self.__finish_loading()
+    def __finish_loading(self):
         self.__update(no_change = True)
+        self.__history = []
+        self.__record()
     def add_settings(self, settings):
         counter = 0
         for e in self.__entries:
@@ -91,121 +112,183 @@ class EquationEditor(ScrollableFrame):
             entry.div.pack_forget()
             self.__dividers.remove(entry.div)
         self.__entries.remove(entry)
-        self.__update(entry)
+        if entry in self.__loading:
+            self.__load_entry(entry)
+        else:
+            self.__update(entry)
+    def __set_entries(self, entries):
+        if entries == self.__entries: return
+        for e in self.__entries:
+            if e not in entries: e.cancel_updates()
+        for w in self.__entries + self.__dividers:
+            w.pack_forget()
+        self.__entries = list(entries)
+        self.__dividers = [e.div for e in self.__entries]
+        for e in self.__entries:
+            if self.__entry_width is not None: e.set_width(self.__entry_width)
+            e.pack(fill = tk.BOTH, expand = True)
+            e.div.pack(fill = tk.BOTH, expand = True)
     def __entry_config(self, width):
         self.__entry_width = width
         for e in self.__entries:
             e.set_width(self.__entry_width)
 
-    def __update(self, changed_eq = None, no_change = False):
-        unbound = [None, Parser.X, Parser.Y, Parser.Z]
+    def __update_parameter(self, changed_eq):
+        p = changed_eq.get_parsed()
+        if p.has_error() or not p.has_binding(): return False
+        bind = p.get_binding()
+        old = [b for b in self.__bindings if b.get_equation() is changed_eq]
+        if len(old) != 1 or not old[0].is_parameter() or not bind.is_parameter() \
+            or old[0].get_name() != bind.get_name():
+            return False
+        bind.set_parameters(self.__parameters)
+        self.__bindings[self.__bindings.index(old[0])] = bind
+        self.__parameters[bind.get_name()] = bind.get_value()
+        changed_eq.label(EquationLabelType.VALUE, str(bind))
+        return True
+    @staticmethod
+    def __is_plot(bind):
+        return bind.get_name() in EquationEditor.UNBOUND or isinstance(bind.get_name(), tuple)
+    def __reset_entry(self, e):
+        p = e.get_parsed()
+        p.reset()
+        self.__graph.remove(e)
+        if p.has_error():
+            e.label(EquationLabelType.ERROR, p.get_error())
+        elif p.has_binding():
+            bind = p.get_binding()
+            if bind.get_name() is None and bind.get_plot_type() is None:
+                e.label(EquationLabelType.VALUE, str(bind.get_body()))
+            else:
+                e.label(EquationLabelType.VALUE, str(bind))
+                provides = [] if EquationEditor.__is_plot(bind) else [bind.get_name()]
+                self.__graph.add(e, provides, bind.get_free_symbols(True))
+                return bind
+        else:
+            raise EditorError("Unhandled Parsed state.")
+        return None
+    def __resolve(self, bind, resolved):
+        subst = [(s, resolved[s].get_body()) for s in bind.get_unbound_symbols() if s in resolved]
+        if len(subst) == 0: return
+        bind.substitute(subst)
+        if len(bind.get_unbound_symbols()) == 0: bind.default_ops()
+    def __record(self):
+        snapshot = ([(e, e.get_snapshot()) for e in self.__entries], list(self.__bindings),
+            list(self.__raw_plots), dict(self.__parameters), self.__graph.copy())
+        del self.__history[self.__history_index + 1:]
+        self.__history.append(snapshot)
+        if len(self.__history) > EquationEditor.HISTORY_SIZE: del self.__history[0]
+        self.__history_index = len(self.__history) - 1
+    def __restore(self, index):
+        self.__history_index = index
+        states, bindings, plots, parameters, graph = self.__history[index]
+        self.__set_entries([e for (e, _) in states])
+        for (e, state) in states:
+            e.restore_snapshot(state)
+        self.__bindings = list(bindings)
+        self.__raw_plots = list(plots)
+        self.__parameters.clear()
+        self.__parameters.update(parameters)
+        self.__graph = graph.copy()
+        self.__await_bindings(self.__bindings + self.__raw_plots)
+        self.__replot()
+    def undo(self):
+        if self.__history_index > 0: self.__restore(self.__history_index - 1)
+    def redo(self):
+        if self.__history_index < len(self.__history) - 1: self.__restore(self.__history_index + 1)
+
+    def __update(self, changed_eq = None, no_change = False, record = True):
+        if changed_eq in self.__loading:
+            self.__load_entry(changed_eq)
+            return
+        if changed_eq is not None and self.__update_parameter(changed_eq):
+            self.__replot(no_change = True)
+            if record: self.__record()
+            if not no_change: self.__change_func()
+            return
 
+        fresh = {}
         if changed_eq is None:
-            self.__bindings = []
-            self.__plots = []
-            unaffected_eqs = []
+            self.__graph.clear()
+            stale = set(self.__entries)
         else:
-            unaffected_eqs = []
-            affected_names = []
-            valid_name_check = lambda name : not name in unbound and not isinstance(name, tuple)
-            for b in self.__bindings + self.__plots:
-                if b.get_equation() is changed_eq:
-                    name = b.get_name()
-                    if valid_name_check(name): affected_names.append(name)
-                else:
-                    unaffected_eqs.append(b.get_equation())
-            while len(unaffected_eqs) > 0:
-                has_changed = False
-                for b in self.__bindings + self.__plots:
-                    if b.get_equation() not in unaffected_eqs:
-                        continue
-                    name = b.get_name()
-                    symbols = b.get_free_symbols(True)
-                    if valid_name_check(name): symbols.add(name)
-                    if len(symbols.intersection(affected_names)) > 0:
-                        has_changed = True
-                        unaffected_eqs.remove(b.get_equation())
-                        if valid_name_check(name):
-                            affected_names.append(name)
-                if not has_changed: break
-            self.__bindings = [b for b in self.__bindings if b.get_equation() in unaffected_eqs]
-            self.__plots = [b for b in self.__plots if b.get_equation() in unaffected_eqs]
-
-        def rm_dupes(var):
-            def _rm_dupes(b, v = var):
-                rm = b.get_name() == v
-                if rm: b.get_equation().label(EquationLabelType.ERROR, "Multiple definitions.")
-                return rm
-            return _rm_dupes
-
-        bound = list(map(lambda b : b.get_name(), self.__bindings))
+            names = set(self.__graph.get_provides(changed_eq))
+            if changed_eq in self.__entries:
+                fresh[changed_eq] = self.__reset_entry(changed_eq)
+            else:
+                self.__graph.remove(changed_eq)
+            names.update(self.__graph.get_provides(changed_eq))
+            stale = self.__graph.get_affected(names)
+            stale.add(changed_eq)
         for e in self.__entries:
-            p = e.get_parsed()
-            if e in unaffected_eqs:
+            if e in stale and e not in fresh: fresh[e] = self.__reset_entry(e)
+        self.__bindings = [b for b in self.__bindings if b.get_equation() not in stale]
+        self.__plots = [b for b in self.__plots if b.get_equation() not in stale]
+
+        for (e, bind) in list(fresh.items()):
+            if bind is None:
+                del fresh[e]
+            elif not EquationEditor.__is_plot(bind) \
+                and len(self.__graph.get_providers(bind.get_name())) > 1:
+                e.label(EquationLabelType.ERROR, "Multiple definitions.")
+                del fresh[e]
+
+        self.__parameters.clear()
+        for b in self.__bindings + self.__plots + list(fresh.values()):
+            b.set_parameters(self.__parameters)
+        for b in self.__bindings + list(fresh.values()):
+            if not EquationEditor.__is_plot(b) and b.is_parameter():
+                self.__parameters[b.get_name()] = b.get_value()
+
+        resolved = dict((b.get_name(), b) for b in self.__bindings)
+        for e in self.__graph.order(fresh.keys()):
+            bind = fresh[e]
+            try:
+                self.__resolve(bind, resolved)
+            except Exception as ex:
+                bind.label(EquationLabelType.ERROR, str(ex))
                 continue
-            p.reset()
-            if p.has_error():
-                e.label(EquationLabelType.ERROR, p.get_error())
-            elif p.has_binding():
-                bind = p.get_binding()
-                if bind.get_name() is None and bind.get_plot_type() is None:
-                    e.label(EquationLabelType.VALUE, str(bind.get_body()))
-                else:
-                    e.label(EquationLabelType.VALUE, str(bind))
-                    if bind.get_name() in unbound or isinstance(bind.get_name(), tuple):
-                        self.__plots.append(bind)
-                    else:
-                        self.__bindings.append(bind)
-                        if bind.get_name() in bound:
-                            bound.remove(bind.get_name())
-                            self.__bindings = list(filter(rm_dupes(bind.get_name()),
-                                self.__bindings))
-                        else:
-                            bound.append(bind.get_name())
+            if EquationEditor.__is_plot(bind):
+                self.__plots.append(bind)
+            elif len(bind.get_unbound_symbols()) > 0:
+                bind.label(EquationLabelType.ERROR, "Unresolvable.")
             else:
-                raise EditorError("Unhandled Parsed state.")
-
-        used = []
-        while len(used) < len(self.__bindings):
-            to_subst = [b for b in self.__bindings if not b in used and \
-                len(b.get_free_symbols()) == 0]
-            used.extend(to_subst)
-            if len(to_subst) == 0:
-                break
-            for sub in to_subst:
-                subst = [(sub.get_name(), sub.get_body())]
-                for bind in list(self.__bindings + self.__plots):
-                    if sub == bind: continue
-                    try:
-                        if sub.binds_func():
-                            bind.replace(subst)
-                        elif sub.binds_var():
-                            bind.subs(subst)
-                        else:
-                            raise EditorError("Unexpected binding type.")
-                        if len(bind.get_free_symbols()) == 0: bind.default_ops()
-                    except Exception as e:
-                        bind.label(EquationLabelType.ERROR, str(e))
-                        if bind in self.__bindings: self.__bindings.remove(bind)
-                        if bind in self.__plots: self.__plots.remove(bind)
-
-        for b in self.__bindings:
-            if not b in used: b.label(EquationLabelType.ERROR, "Unresolvable.")
-        self.__bindings = used
+                resolved[bind.get_name()] = bind
+                self.__bindings.append(bind)
+        index = dict((e, i) for (i, e) in enumerate(self.__entries))
+        self.__bindings.sort(key = lambda b : index[b.get_equation()])
+        self.__plots.sort(key = lambda b : index[b.get_equation()])
 
         for p in self.__plots:
-            fv = p.get_free_symbols()
+            fv = p.get_unbound_symbols()
             if len(fv) > 0:
                 p.label(EquationLabelType.ERROR, "Unbound: " + str(fv))
             elif not p.is_valid():
                 p.label(EquationLabelType.ERROR, "Invalid atoms.")
             else:
                 p.get_equation().label()
+        self.__await_bindings(self.__bindings + self.__plots)
         self.__raw_plots = list(filter(lambda p : p.is_valid() \
-            and len(p.get_free_symbols()) == 0, self.__plots))
+            and len(p.get_unbound_symbols()) == 0, self.__plots))
 
         self.__replot(no_change = True)
+        if record: self.__record()
         if not no_change: self.__change_func()
+    def __await_bindings(self, bindings):
+        if self.__pending_id is not None:
+            DelayTracker.get_instance().end_delay(self, self.__pending_id)
+        self.__pending_id = None
+        self.__pending = [b for b in bindings if b.is_pending()]
+        if len(self.__pending) == 0: return
+        self.__pending_id = self.after(EquationEditor.BINDING_POLL, self.__poll_bindings)
+        DelayTracker.get_instance().add_delay(self, self.__pending_id)
+    def __poll_bindings(self):
+        DelayTracker.get_instance().remove_delay(self, self.__pending_id)
+        self.__pending_id = None
+        done = [b.get_equation() for b in self.__pending if not b.is_pending()]
+        self.__await_bindings(self.__pending)
+        for e in done:
+            if e in self.__entries: self.__update(e, True, False)
     def __replot(self, no_change = False):
         self.__plots = self.__raw_plots
         plot_entries = list(map(lambda p : p.get_equation(), self.__plots))
@@ -50,7 +50,8 @@ class EquationViewer(tk.Frame):
     ELEV_KEY = "view_elev"
     AZIM_KEY = "view_azim"
     CUBOID_KEY = "view_cuboid"
-    DETAIL_KEY = "points_per_unit"
+    DETAIL_KEY = "screen_detail"
+    UNIT_DETAIL_KEY = "points_per_unit"
 
     def __init__(self, parent, width, change_func):
         super().__init__(parent)
@@ -235,7 +236,10 @@ class EquationViewer(tk.Frame):
         self.__mode_switcher(Dimension(int(dim)))
         self.__plot.set_view(self.__elev, self.__azim)
 
-        self.__plot.set_detail(float(settings.get(EquationViewer.DETAIL_KEY, "2")))
+        if EquationViewer.DETAIL_KEY not in settings and EquationViewer.UNIT_DETAIL_KEY in settings:
+            self.__plot.set_unit_detail(float(settings[EquationViewer.UNIT_DETAIL_KEY]))
+        else:
+            self.__plot.set_detail(float(settings.get(EquationViewer.DETAIL_KEY, "2")))
     def add_settings(self, settings):
         settings[EquationViewer.DIM_KEY] = self.__mode.value
         settings[EquationViewer.RECT_KEY] = " ".join(map(str, self.__view_rect))
@@ -6,6 +6,8 @@ from utils.images import ImageManager
 from utils.files import FileManager
 from utils.theme import Theme
 from utils.parsing import Parser
+from utils.kernels import KernelManager
+from utils.worker import SymbolicWorker
 from utils.delay import DelayTracker
 
 from components.equationEditor import EquationEditor
@@ -19,12 +21,17 @@ class Helix:
 
         self.__root.bind("<Control-s>", lambda _e : self.__save_project(False))
         self.__root.bind("<Control-S>", self.__save_project)
+        self.__root.bind("<Control-z>", lambda _e : self.__frame_editor.undo())
+        self.__root.bind("<Control-y>", lambda _e : self.__frame_editor.redo())
+        self.__root.bind("<Control-Z>", lambda _e : self.__frame_editor.redo())
 
         self.__fonts = FontManager(self.__root)
         self.__images = ImageManager()
         self.__files = FileManager()
         self.__theme = Theme()
-        self.__parser = Parser()
+        self.__worker = SymbolicWorker()
+        self.__parser = Parser(not self.__worker.is_available())
+        self.__kernels = KernelManager()
         self.__delayTracker = DelayTracker()
 
         self.__width = 1280
@@ -32,6 +39,7 @@ class Helix:
 
         self.__menu = Menu(self.__root)
         self.__file_menu = Menu(self.__menu, tearoff = 0)
+        self.__edit_menu = Menu(self.__menu, tearoff = 0)
 
         self.__frame_editor = None
         self.__frame_viewer = None
@@ -62,6 +70,12 @@ class Helix:
         self.__file_menu.add_separator()
         self.__file_menu.add_command(label = "Exit", command = self.__root.quit)
         self.__menu.add_cascade(label = "File", menu = self.__file_menu)
+        # Edit Menu
+        self.__edit_menu.add_command(label = "Undo", accelerator = "Ctrl+Z",
+            command = lambda : self.__frame_editor.undo())
+        self.__edit_menu.add_command(label = "Redo", accelerator = "Ctrl+Y",
+            command = lambda : self.__frame_editor.redo())
+        self.__menu.add_cascade(label = "Edit", menu = self.__edit_menu)
         # About Button
         self.__menu.add_command(label = "About", command = lambda :
             showinfo("Helix Graphing Tool", "Written by Tyler Wright\n"
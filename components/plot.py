@@ -9,16 +9,26 @@ from utils.delay import DelayTracker
 from utils.maths import Dimension
 from utils.parsing import Parser
 from utils.series import HelixSeries
+from utils.cache import LRUCache
+
+from components.equation import EquationLabelType
 
 class HelixPlot(FigureCanvasTkAgg):
 
+    RETIRED_SIZE = 32
+    DETAIL_PIXELS = 32
+    ANALYSIS_POLL = 50
+
     def __init__(self, parent, detail, press_func, drag_func, zoom_func):
         super().__init__(mpl.figure.Figure(), master = parent)
         theme = Theme.get_instance()
 
         self.__axis = None
 
-        self.__data = []
+        self.__data = {}
+        self.__errors = {}
+        self.__plots = []
+        self.__retired = LRUCache(HelixPlot.RETIRED_SIZE)
 
         self.__xlim = (-10, 10)
         self.__ylim = (-10, 10)
@@ -31,6 +41,9 @@ class HelixPlot(FigureCanvasTkAgg):
         self.__debounce_id = None
         self.__debounce_delay = 300
 
+        self.__analysing = set()
+        self.__analysis_id = None
+
         self.__dim = None
 
         self.__figure = self.figure
@@ -82,7 +95,7 @@ class HelixPlot(FigureCanvasTkAgg):
         def detail_func(*_args):
             DelayTracker.get_instance().remove_delay(self.widget(), self.__debounce_detail_id)
             v = Parser.get_instance().parse_number(self.__detailer_var.get())
-            if v is None: return None
+            if v is None or float(v) == self.__detail: return None
             self.set_detail(float(v))
 
         def debounce_detail_func(*_args):
@@ -94,7 +107,7 @@ class HelixPlot(FigureCanvasTkAgg):
         self.__debounce_detail_id = None
         self.__debounce_delay = 500
 
-        self.__detail_label = tk.Label(self.widget(), text = "Points per unit:")
+        self.__detail_label = tk.Label(self.widget(), text = "Detail:")
         theme.configure_label(self.__detail_label)
         theme.configure_viewer(self.__detail_label)
 
@@ -148,14 +161,42 @@ class HelixPlot(FigureCanvasTkAgg):
     def set_plots(self, plots, dim):
         if self.__dim is not dim:
             raise ValueError("Incorrect plot dimension.")
-        input_sigs = list(map(lambda s : s.get_signature(), plots))
-        to_remove = [d for d in self.__data if d.get_signature() not in input_sigs]
-        self.__data = [d for d in self.__data if not d in to_remove]
-        current_sigs = list(map(lambda s : s.get_signature(), self.__data))
-        plots = [p for p in plots if p.get_signature() not in current_sigs]
-        for p in plots:
-            series = [HelixSeries.generate_series(p, self.__detail) for p in p.split()]
-            self.__data.extend(list(filter(lambda s : s is not None, series)))
+        signed = [(p, p.get_signature()) for p in plots]
+        sigs = set(s for (_, s) in signed)
+        for (s, d) in self.__data.items():
+            if s not in sigs: self.__retired.put(s, d)
+        self.__data = dict((s, d) for (s, d) in self.__data.items() if s in sigs)
+        self.__errors = dict((s, e) for (s, e) in self.__errors.items() if s in sigs)
+        for (p, s) in signed:
+            if s in self.__data: continue
+            d = self.__retired.get(s)
+            if d is None:
+                try:
+                    d = HelixSeries.generate_series(p, self.__get_detail())
+                except Exception as e:
+                    self.__errors[s] = "Could not plot: " + str(e)
+                    p.label(EquationLabelType.ERROR, self.__errors[s])
+                    continue
+            else:
+                self.__retired.remove(s)
+            if self.__errors.pop(s, None) is not None: p.label(EquationLabelType.VALUE, str(p))
+            self.__data[s] = d
+        self.__plots = [(p, s) for (p, s) in signed if s in self.__data]
+        self.__await_analysis()
+    def __await_analysis(self):
+        if self.__analysis_id is not None:
+            DelayTracker.get_instance().end_delay(self.widget(), self.__analysis_id)
+        self.__analysis_id = None
+        self.__analysing = set(s for (s, d) in self.__data.items() if d.is_pending())
+        if len(self.__analysing) == 0: return
+        self.__analysis_id = self.widget().after(HelixPlot.ANALYSIS_POLL, self.__poll_analysis)
+        DelayTracker.get_instance().add_delay(self.widget(), self.__analysis_id)
+    def __poll_analysis(self):
+        DelayTracker.get_instance().remove_delay(self.widget(), self.__analysis_id)
+        self.__analysis_id = None
+        done = [s for s in self.__analysing if s in self.__data and not self.__data[s].is_pending()]
+        self.__await_analysis()
+        if len(done) > 0: self.redraw()
 
     def __debounce_redraw(self):
         if self.__debounce_id is not None:
@@ -168,7 +209,15 @@ class HelixPlot(FigureCanvasTkAgg):
             DelayTracker.get_instance().remove_delay(self.widget(), self.__debounce_id)
             self.__debounce_id = None
             self.__axis.clear()
-            for p in self.__data: p.draw(self.__axis, self.__xlim, self.__ylim, self.__zlim)
+            detail = self.__get_detail()
+            for (p, s) in self.__plots:
+                d = self.__data[s]
+                d.set_plot(p)
+                try:
+                    d.set_detail(detail)
+                    d.draw(self.__axis, self.__xlim, self.__ylim, self.__zlim)
+                except Exception as e:
+                    p.label(EquationLabelType.ERROR, "Could not draw: " + str(e))
         self.__limit_plot()
         self.draw()
     def __limit_plot(self):
@@ -186,10 +235,17 @@ class HelixPlot(FigureCanvasTkAgg):
             self.__axis3.set_ylabel('$y$', fontsize = 20)
             self.__axis3.set_zlabel('$z$', fontsize = 20)
 
+    def __get_scale(self):
+        span = self.__xlim[1] - self.__xlim[0]
+        if self.__dim is Dimension.THREE_D: span = max(span, self.__ylim[1] - self.__ylim[0])
+        return self.__figure.bbox.width / (span * HelixPlot.DETAIL_PIXELS)
+    def __get_detail(self):
+        return self.__detail * self.__get_scale()
     def get_detail(self):
         return self.__detail
     def set_detail(self, detail):
         self.__detail = detail
-        for d in self.__data:
-            d.set_detail(detail)
         self.redraw()
+    def set_unit_detail(self, detail):
+        self.set_detail(detail / self.__get_scale())
+        self.__detailer_var.set(str(self.__detail))
@@ -0,0 +1,5 @@
+def get_instance(cls, *args):
+    try:
+        return cls.get_instance()
+    except Exception:
+        return cls(*args)
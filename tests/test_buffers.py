@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from utils.buffers import SegmentBuffer
+
+class SegmentBufferTest(unittest.TestCase):
+
+    @staticmethod
+    def get_segments(xs):
+        xs = np.asarray(xs, dtype = float)
+        return np.stack((np.column_stack((xs, xs)), np.column_stack((xs + 1, xs))), axis = 1)
+
+    def test_sorted(self):
+        buffer = SegmentBuffer(4)
+        buffer.append(self.get_segments([2, 3, 4]))
+        buffer.prepend(self.get_segments([0, 1]))
+        buffer.append(self.get_segments([5]))
+        buffer.append(self.get_segments([-1]))
+        self.assertEqual(len(buffer), 7)
+        np.testing.assert_array_equal(buffer.get_keys(), np.arange(-1, 6))
+        np.testing.assert_array_equal(buffer.get_data()[:, 0, 0], np.arange(-1, 6))
+    def test_growth(self):
+        buffer = SegmentBuffer(2)
+        for i in range(50):
+            buffer.prepend(self.get_segments([-i]))
+            buffer.append(self.get_segments([i + 1]))
+        self.assertEqual(len(buffer), 100)
+        np.testing.assert_array_equal(buffer.get_keys(), np.arange(-49, 51))
+    def test_query(self):
+        buffer = SegmentBuffer()
+        buffer.append(self.get_segments(np.arange(10)))
+        buffer.append([[[-5, 0], [5, 0]]])
+        window = buffer.query((3.5, 5.5), (-1, 10))
+        self.assertEqual(sorted(window[:, 0, 0]), [-5, 3, 4, 5])
+        self.assertEqual(len(buffer.query((3.5, 5.5), (20, 30))), 0)
+        self.assertEqual(buffer.get_extent(), 10)
+    def test_clear(self):
+        buffer = SegmentBuffer()
+        buffer.append(self.get_segments([1, 2]))
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(len(buffer.query((0, 5), (0, 5))), 0)
@@ -0,0 +1,122 @@
+import os
+import unittest
+from unittest import mock
+
+import sympy as sy
+
+from support import get_instance
+
+from utils.files import FileManager
+from utils.cache import LRUCache, SolveCache, DiskStore, Serialiser, SerialiserError
+
+class LRUCacheTest(unittest.TestCase):
+
+    def test_eviction_order(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertNotIn("b", cache)
+        self.assertEqual([cache.get(k) for k in ("a", "c")], [1, 3])
+        self.assertEqual(len(cache), 2)
+    def test_weigher(self):
+        cache = LRUCache(10, len)
+        cache.put("a", "x" * 6)
+        cache.put("b", "x" * 6)
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.get_stats()["weight"], 6)
+        cache.put("c", "x" * 20)
+        self.assertEqual(len(cache), 1)
+        cache.remove("c")
+        self.assertEqual(cache.get_stats()["weight"], 0)
+    def test_stats(self):
+        cache = LRUCache(4)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("b")
+        self.assertEqual((cache.get_hits(), cache.get_misses()), (1, 1))
+        self.assertEqual(cache.get("b", 5), 5)
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+class SerialiserTest(unittest.TestCase):
+
+    def assertRoundTrip(self, value):
+        self.assertEqual(Serialiser.loads(Serialiser.dumps(value)), value)
+
+    def test_round_trip(self):
+        x, y = sy.symbols("x y")
+        self.assertRoundTrip((sy.sin(x) + y ** 2, [sy.Rational(1, 3), -sy.oo], { x : 1.5 }))
+        self.assertRoundTrip(sy.Piecewise((x, x > 0), (-x, True)))
+        self.assertRoundTrip(sy.Interval.Ropen(0, sy.pi) | sy.FiniteSet(5))
+        self.assertRoundTrip(set([x, y]))
+        self.assertRoundTrip(sy.Function("f")(x) + sy.Integral(x, (x, 0, 1)))
+    def test_rejects_code(self):
+        for text in ("__import__('os')", "Symbol('x').__class__", "(lambda : 1)()",
+            "open('f')", "[x for x in ()]", "Symbol(name = Symbol)", "Symbol("):
+            with self.assertRaises(SerialiserError):
+                Serialiser.loads(text)
+
+class DiskStoreTest(unittest.TestCase):
+
+    NAME = "test_store"
+
+    def setUp(self):
+        get_instance(FileManager)
+        self.path = FileManager.get_files_path(DiskStoreTest.NAME)
+        self.tearDown()
+    def tearDown(self):
+        if os.path.exists(self.path): os.remove(self.path)
+
+    def test_capacity(self):
+        store = DiskStore(DiskStoreTest.NAME, 2)
+        for k in "abc": store.put(k, k.upper())
+        self.assertEqual(len(store), 2)
+        self.assertIsNone(store.get("a"))
+        self.assertEqual(store.get("c"), "C")
+    def test_compaction(self):
+        store = DiskStore(DiskStoreTest.NAME, 3)
+        for k in "abcde": store.put(k, k.upper())
+        store.put("c", "X")
+        with open(self.path) as f: self.assertEqual(len(f.readlines()), 6)
+        store = DiskStore(DiskStoreTest.NAME, 3)
+        self.assertEqual(len(store), 3)
+        self.assertEqual([store.get(k) for k in "cde"], ["X", "D", "E"])
+        with open(self.path) as f: self.assertEqual(len(f.readlines()), 3)
+    def test_not_persistent(self):
+        store = DiskStore(DiskStoreTest.NAME, 2, False)
+        store.put("a", "A")
+        self.assertIsNone(store.get("a"))
+        self.assertFalse(os.path.exists(self.path))
+
+class SolveCacheTest(unittest.TestCase):
+
+    def test_key(self):
+        x = sy.Symbol("x")
+        key = SolveCache.key("domain", sy.sqrt(x), x, sy.S.Reals)
+        self.assertEqual(key, SolveCache.key("domain", sy.sqrt(x), x, sy.S.Reals))
+        self.assertNotEqual(key, SolveCache.key("domain", sy.log(x), x, sy.S.Reals))
+    def test_memory(self):
+        cache = SolveCache(2, False)
+        x = sy.Symbol("x")
+        key = SolveCache.key("domain", sy.sqrt(x), x, sy.S.Reals)
+        cache.put(key, sy.Interval(0, sy.oo))
+        self.assertEqual(cache.get(key), sy.Interval(0, sy.oo))
+        self.assertIsNone(cache.get(SolveCache.key("domain", x, x, sy.S.Reals)))
+    def test_revision(self):
+        get_instance(FileManager)
+        path = FileManager.get_files_path(DiskStoreTest.NAME)
+        x = sy.Symbol("x")
+        key = SolveCache.key("domain", sy.sqrt(x), x, sy.S.Reals)
+        try:
+            with mock.patch.object(SolveCache, "FILE_NAME", DiskStoreTest.NAME):
+                SolveCache(2).put(key, sy.Interval(0, sy.oo))
+                self.assertEqual(SolveCache(2).get(key), sy.Interval(0, sy.oo))
+                with mock.patch.object(SolveCache, "REVISION", SolveCache.REVISION + 1):
+                    self.assertIsNone(SolveCache(2).get(key))
+                with mock.patch.object(sy, "__version__", "0.0"):
+                    self.assertIsNone(SolveCache(2).get(key))
+        finally:
+            if os.path.exists(path): os.remove(path)
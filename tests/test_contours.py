@@ -0,0 +1,33 @@
+import unittest
+
+import numpy as np
+
+from utils.contours import MarchingSquares
+
+class MarchingSquaresTest(unittest.TestCase):
+
+    def test_cases(self):
+        v = np.array([[1.0, -1.0, 1.0], [-1.0, 1.0, np.nan]])
+        np.testing.assert_array_equal(MarchingSquares.get_cases(v), [[5, 0]])
+        self.assertEqual(len(MarchingSquares.get_cells(np.ones((1, 4, 4)))[0]), 0)
+    def test_spread(self):
+        v = -np.ones((1, 7, 7))
+        v[0, 3, 3] = 1
+        self.assertEqual(len(MarchingSquares.get_cells(v)[0]), 4)
+        self.assertEqual(len(MarchingSquares.get_cells(v, 1)[0]), 12)
+    def test_circle(self):
+        t = np.linspace(-2, 2, 41)
+        x, y = np.meshgrid(t, t)
+        v = (x * x + y * y - 1)[None]
+        segments, scale = MarchingSquares.get_segments(t[None], t[None], v)
+        self.assertGreater(len(segments), 0)
+        self.assertEqual(len(scale), len(segments))
+        radii = np.hypot(segments[..., 0], segments[..., 1])
+        np.testing.assert_allclose(radii, 1, atol = 0.01)
+    def test_saddle(self):
+        t = np.array([0.0, 1.0])
+        for centre in (1, -1):
+            v = np.array([[[1.0, -1.0], [-1.0, 1.0]]]) * (1 + 0.1 * centre)
+            v[0, 0, 0] += 0.2 * centre
+            segments, _ = MarchingSquares.get_segments(t[None], t[None], v)
+            self.assertEqual(len(segments), 2)
@@ -0,0 +1,66 @@
+import unittest
+
+import tkinter as tk
+
+from support import get_instance
+
+from utils.fonts import FontManager
+from utils.images import ImageManager
+from utils.files import FileManager
+from utils.theme import Theme
+from utils.parsing import Parser
+from utils.kernels import KernelManager
+from utils.delay import DelayTracker
+
+from components.equation import Equation
+from components.equationEditor import EquationEditor
+
+class EquationEditorHistoryTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            cls.root = tk.Tk()
+        except tk.TclError as e:
+            raise unittest.SkipTest("Tk unavailable: " + str(e))
+        get_instance(FontManager, cls.root)
+        for manager in (ImageManager, FileManager, Theme, Parser, DelayTracker):
+            get_instance(manager)
+        get_instance(KernelManager)
+    @classmethod
+    def tearDownClass(cls):
+        DelayTracker.get_instance().end_all()
+        cls.root.destroy()
+
+    def setUp(self):
+        self.plots = []
+        self.frame = tk.Frame(self.root)
+        self.frame.pack()
+        self.editor = EquationEditor(self.frame, 1, self.plots.append, lambda : None)
+        self.editor.set_settings({ EquationEditor.EQUATION_KEY + "0" : str({ "text" : "a = 2" }) })
+        self.root.update()
+    def tearDown(self):
+        self.frame.destroy()
+
+    def get_entries(self):
+        frame = self.editor.get_inner_frame()
+        return [w for w in frame.pack_slaves() if isinstance(w, Equation)]
+    def add_entry(self):
+        button = next(w for w in self.frame.winfo_children()
+            if isinstance(w, tk.Button) and w.cget("text") == "+")
+        button.invoke()
+        self.root.update()
+        return self.get_entries()[-1]
+
+    def test_add_undo_redo(self):
+        first = self.get_entries()
+        added = self.add_entry()
+        self.assertEqual(self.get_entries(), first + [added])
+        self.editor.undo()
+        self.assertEqual(self.get_entries(), first)
+        self.assertEqual(added.winfo_manager(), "")
+        self.editor.redo()
+        self.assertEqual(self.get_entries(), first + [added])
+        settings = {}
+        self.editor.add_settings(settings)
+        self.assertEqual(len(settings), 2)
@@ -0,0 +1,42 @@
+import unittest
+
+from utils.graph import DependencyGraph
+
+class DependencyGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = DependencyGraph()
+        self.graph.add("a", ["a"], [])
+        self.graph.add("b", ["b"], ["a"])
+        self.graph.add("c", ["c"], ["b"])
+        self.graph.add("plot", [], ["c", "t"])
+
+    def test_indexes(self):
+        self.assertEqual(self.graph.get_providers("a"), { "a" })
+        self.assertEqual(self.graph.get_dependents("b"), { "c" })
+        self.assertEqual(self.graph.get_requires("plot"), frozenset(["c", "t"]))
+        self.assertEqual(len(self.graph), 4)
+    def test_affected(self):
+        self.assertEqual(self.graph.get_affected(["a"]), { "a", "b", "c", "plot" })
+        self.assertEqual(self.graph.get_affected(["c"]), { "c", "plot" })
+        self.assertEqual(self.graph.get_affected(["t"]), { "plot" })
+        self.assertEqual(self.graph.get_affected(["z"]), set())
+    def test_order(self):
+        self.assertEqual(self.graph.order(["plot", "c", "b", "a"]), ["a", "b", "c", "plot"])
+        self.assertEqual(self.graph.order(["c", "plot"]), ["c", "plot"])
+    def test_cycle(self):
+        self.graph.add("a", ["a"], ["c"])
+        order = self.graph.order(["a", "b", "c"])
+        self.assertEqual(sorted(order), ["a", "b", "c"])
+    def test_remove(self):
+        self.graph.remove("b")
+        self.assertNotIn("b", self.graph)
+        self.assertEqual(self.graph.get_providers("b"), set())
+        self.assertEqual(self.graph.get_affected(["a"]), { "a" })
+    def test_copy(self):
+        copy = self.graph.copy()
+        copy.remove("a")
+        copy.add("d", ["d"], ["a"])
+        self.assertIn("a", self.graph)
+        self.assertNotIn("d", self.graph)
+        self.assertEqual(self.graph.get_dependents("a"), { "b" })
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+import sympy as sy
+
+from support import get_instance
+
+from utils.kernels import Kernel, KernelError, KernelManager
+
+class KernelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.x, self.y = sy.symbols("x y")
+        self.xs = np.linspace(-3, 3, 13)
+
+    def test_evaluate(self):
+        kernel = Kernel((self.x, self.y), sy.sin(self.x) * self.y + sy.exp(self.x))
+        np.testing.assert_allclose(kernel(self.xs, 2), np.sin(self.xs) * 2 + np.exp(self.xs))
+    def test_optimised(self):
+        body = sum(i * self.x ** i for i in range(1, 7))
+        kernel = Kernel((self.x,), body)
+        before, after = kernel.get_op_counts()
+        self.assertLess(after, before)
+        np.testing.assert_allclose(kernel(self.xs),
+            sum(i * self.xs ** i for i in range(1, 7)))
+    def test_tuple(self):
+        result = Kernel((self.x,), (self.x, 2 * self.x, sy.Integer(1)))(self.xs)
+        self.assertIsInstance(result, tuple)
+        np.testing.assert_array_equal(result[2], np.ones_like(self.xs))
+    def test_constant(self):
+        np.testing.assert_array_equal(Kernel((self.x,), sy.pi)(self.xs),
+            np.full(self.xs.shape, np.pi))
+    def test_complex(self):
+        result = Kernel((self.x,), sy.sqrt(self.x) + sy.log(self.x))(self.xs)
+        self.assertTrue(np.isnan(result[self.xs < 0]).all())
+        self.assertTrue(np.isfinite(result[self.xs > 0]).all())
+    def test_unsupported(self):
+        with self.assertRaises(KernelError):
+            Kernel((self.x,), sy.Function("f")(self.x))
+    def test_manager(self):
+        manager = get_instance(KernelManager)
+        kernel = manager.get_kernel((self.x,), self.x ** 2 + 1)
+        self.assertIs(manager.get_kernel((self.x,), self.x ** 2 + 1), kernel)
+        self.assertIsNot(manager.get_kernel((self.x,), self.x ** 2 + 2), kernel)
+
+class KernelCalculusTest(unittest.TestCase):
+
+    def setUp(self):
+        self.x, self.y, self.s = sy.symbols("x y s")
+
+    def assertMatchesSympy(self, expr, values, result):
+        for v, r in zip(values, result):
+            expected = complex(expr.subs(self.x, v).evalf())
+            self.assertAlmostEqual(complex(r), expected, places = 6)
+
+    def test_integral_constant_limits(self):
+        expr = sy.Integral(sy.sin(self.x * sy.sin(self.s)), (self.s, 0, 1))
+        values = np.linspace(-2, 2, 7)
+        result = Kernel((self.x,), expr)(values)
+        self.assertEqual(np.shape(result), values.shape)
+        self.assertMatchesSympy(expr, values, result)
+    def test_integral_constant_limits_surface(self):
+        expr = sy.Integral(sy.sin(self.x * self.s) + self.y, (self.s, 0, 1))
+        xs, ys = np.meshgrid(np.linspace(0, 1, 3), np.linspace(0, 1, 4))
+        result = Kernel((self.x, self.y), expr)(xs, ys)
+        self.assertEqual(np.shape(result), xs.shape)
+        expected = ys + (1 - np.cos(xs)) / np.where(xs == 0, 1, xs)
+        np.testing.assert_allclose(np.real(result), expected, atol = 1e-9)
+    def test_integral_variable_limits(self):
+        expr = sy.Integral(sy.exp(-self.s ** 2), (self.s, 0, self.x))
+        values = np.linspace(-2, 2, 7)
+        result = Kernel((self.x,), expr)(values)
+        np.testing.assert_allclose(np.real(result), [float(sy.erf(v)) * np.sqrt(np.pi) / 2
+            for v in values], atol = 1e-9)
+    def test_integral_infinite_limits(self):
+        expr = sy.Integral(sy.exp(-self.x * self.s ** 2), (self.s, -sy.oo, sy.oo))
+        values = np.array([0.5, 1.0, 2.0])
+        result = Kernel((self.x,), expr)(values)
+        np.testing.assert_allclose(np.real(result), np.sqrt(np.pi / values), rtol = 1e-6)
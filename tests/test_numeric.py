@@ -0,0 +1,46 @@
+import math
+import unittest
+
+from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor
+
+from utils.numeric import NumericEvaluator
+
+class NumericEvaluatorTest(unittest.TestCase):
+
+    TRANSFORMATIONS = standard_transformations + (convert_xor,)
+
+    def assertMatchesSympy(self, text):
+        expected = float(parse_expr(text, transformations = NumericEvaluatorTest.TRANSFORMATIONS))
+        self.assertAlmostEqual(NumericEvaluator.evaluate(text), expected)
+
+    def test_numbers(self):
+        self.assertEqual(NumericEvaluator.evaluate("2"), 2.0)
+        self.assertEqual(NumericEvaluator.evaluate(" -1.5 "), -1.5)
+        self.assertEqual(NumericEvaluator.evaluate("1e3"), 1000.0)
+    def test_constants(self):
+        self.assertAlmostEqual(NumericEvaluator.evaluate("2*pi"), 2 * math.pi)
+        self.assertAlmostEqual(NumericEvaluator.evaluate("e"), math.e)
+    def test_functions(self):
+        self.assertAlmostEqual(NumericEvaluator.evaluate("sin(pi/2)"), 1.0)
+        self.assertAlmostEqual(NumericEvaluator.evaluate("log(8, 2)"), 3.0)
+        self.assertAlmostEqual(NumericEvaluator.evaluate("sqrt(16) + ln(e)"), 5.0)
+
+    def test_xor_precedence(self):
+        self.assertEqual(NumericEvaluator.evaluate("1+2^2"), 5.0)
+        self.assertEqual(NumericEvaluator.evaluate("2*3^2"), 18.0)
+        self.assertEqual(NumericEvaluator.evaluate("-2^2"), -4.0)
+        self.assertEqual(NumericEvaluator.evaluate("2^-1"), 0.5)
+        for text in ("1+2^2", "2*3^2", "-2^2", "(1+2)^2/3", "2^0.5*3", "10-2^3-1"):
+            self.assertMatchesSympy(text)
+    def test_xor_associativity(self):
+        self.assertEqual(NumericEvaluator.evaluate("2^3^2"), 512.0)
+        self.assertEqual(NumericEvaluator.evaluate("2^3**2"), 512.0)
+        self.assertEqual(NumericEvaluator.evaluate("(2^3)^2"), 64.0)
+        self.assertMatchesSympy("2^3^2")
+
+    def test_unsupported(self):
+        for text in ("x + 1", "3!", "__import__('os')", "[1, 2]", "1 if 1 else 2", "2 &", ""):
+            self.assertIsNone(NumericEvaluator.evaluate(text))
+    def test_non_finite(self):
+        self.assertIsNone(NumericEvaluator.evaluate("1/0"))
+        self.assertIsNone(NumericEvaluator.evaluate("10^400"))
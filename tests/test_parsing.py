@@ -0,0 +1,47 @@
+import unittest
+import importlib
+
+import sympy as sy
+
+from support import get_instance
+
+from utils.files import FileManager
+from utils.cache import SolveCache
+from utils.parsing import Parser
+
+class NameIndexTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        get_instance(FileManager)
+        cls.parser = get_instance(Parser, False)
+
+    def test_matches_namespace(self):
+        exported = {}
+        for m in Parser.NAMESPACE_NAMES.keys():
+            for n in importlib.import_module(m).__all__: exported[n] = m
+        for e in Parser.NAMESPACE_EXCLUSIONS: exported.pop(e, None)
+        self.assertEqual(Parser.get_name_index(), exported)
+    def test_resolves(self):
+        x = Parser.X
+        self.assertEqual(self.parser.parse("sin(x) + LambertW(x)").atoms(sy.Function),
+            { sy.sin(x), sy.LambertW(x) })
+        self.assertTrue(self.parser.is_defined("integrate"))
+        self.assertFalse(self.parser.is_defined("sympify"))
+
+class DomainTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        get_instance(FileManager)
+        cls.parser = get_instance(Parser, False)
+
+    def test_unsupported(self):
+        x, y = Parser.X, Parser.Y
+        for expr in (sy.sqrt(x) * sy.log(y + x ** 2), sy.log(x + sy.exp(x))):
+            self.assertEqual(self.parser.domain(expr, x), sy.S.Reals)
+            self.assertIn(SolveCache.key("domain", expr, x, sy.S.Reals),
+                self.parser.get_solve_cache())
+    def test_open(self):
+        x = Parser.X
+        self.assertEqual(self.parser.domain(sy.log(x), x), sy.Interval.open(0, sy.oo))
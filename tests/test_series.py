@@ -0,0 +1,84 @@
+import math
+import unittest
+from unittest import mock
+
+import numpy as np
+import sympy as sy
+
+from support import get_instance
+
+from utils.files import FileManager
+from utils.parsing import Parser, Parsed, Binding
+from utils.kernels import KernelManager
+from utils.maths import PlotType
+from utils.series import HelixSeries
+
+class HeldTask:
+
+    held = True
+
+    def __init__(self, task):
+        self.task = task
+
+    def is_done(self):
+        return not HeldTask.held
+    def get_result(self):
+        return self.task.get_result()
+
+class AnalysisTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        get_instance(FileManager)
+        get_instance(Parser, False)
+        get_instance(KernelManager)
+
+    def setUp(self):
+        HeldTask.held = True
+        submit = Parser.submit
+        patcher = mock.patch.object(Parser, "submit",
+            side_effect = lambda *args, **kwargs : HeldTask(submit(*args, **kwargs)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_series(self):
+        series = HelixSeries.generate_series(Parsed("y = log(x)").get_binding(), 8)
+        self.assertTrue(series.is_pending())
+        self.assertIsNone(series._get_domain(Parser.X))
+        HeldTask.held = False
+        self.assertFalse(series.is_pending())
+        self.assertEqual(series._get_domain(Parser.X), [(0.0, float("inf"), True, True)])
+    def test_binding(self):
+        x = Parser.X
+        binding = Binding(Parser.Y, sy.Derivative(sy.sin(x) * x, x), PlotType.LINE_2D)
+        binding.default_ops()
+        self.assertTrue(binding.is_pending())
+        self.assertIsInstance(binding.get_body(), sy.Derivative)
+        HeldTask.held = False
+        self.assertFalse(binding.is_pending())
+        self.assertEqual(binding.get_body(), x * sy.cos(x) + sy.sin(x))
+
+class SamplingTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        get_instance(FileManager)
+        get_instance(Parser, False)
+        get_instance(KernelManager)
+
+    def assertSampledNear(self, text, lim, endpoints):
+        series = HelixSeries.generate_series(Parsed(text).get_binding(), 8)
+        step = 1 / series.get_detail()
+        n = math.ceil((lim[1] - lim[0]) * series.get_detail())
+        samples = np.concatenate(series._get_samples(lim, n, series._get_domain(Parser.X)))
+        self.assertFalse(np.isin([p for (p, _) in endpoints], samples).any())
+        for (point, side) in endpoints:
+            offsets = side * (samples - point)
+            self.assertTrue(((offsets > 0) & (offsets < step)).any(), (text, point, side))
+
+    def test_pole(self):
+        self.assertSampledNear("y = 1/x", (-1, 1), [(0, -1), (0, 1)])
+    def test_boundary(self):
+        self.assertSampledNear("y = log(x)", (-1, 3), [(0, 1)])
+    def test_shifted_pole(self):
+        self.assertSampledNear("y = 1/(x-3)", (2, 4), [(3, -1), (3, 1)])
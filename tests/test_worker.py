@@ -0,0 +1,28 @@
+import time
+import unittest
+
+from utils.worker import SymbolicWorker, WorkerError
+
+def swallow():
+    try:
+        time.sleep(1)
+    except:
+        pass
+    time.sleep(1)
+    return True
+
+class WorkerTaskTest(unittest.TestCase):
+
+    def test_inline(self):
+        self.assertEqual(SymbolicWorker.submit(sum, (1, 2)).get_result(), 3)
+    def test_budget(self):
+        start = time.perf_counter()
+        task = SymbolicWorker.submit(time.sleep, 1, budget = 0.1)
+        with self.assertRaises(WorkerError):
+            task.get_result()
+        self.assertLess(time.perf_counter() - start, 0.5)
+    def test_swallowed(self):
+        start = time.perf_counter()
+        with self.assertRaises(WorkerError):
+            SymbolicWorker.submit(swallow, budget = 0.1).get_result()
+        self.assertLess(time.perf_counter() - start, 0.5)
@@ -0,0 +1,80 @@
+import numpy as np
+
+class SegmentBuffer:
+
+    INITIAL_CAPACITY = 256
+
+    def __init__(self, capacity = INITIAL_CAPACITY):
+        self.__segments = np.empty((capacity, 2, 2))
+        self.__keys = np.empty(capacity)
+        self.__start = capacity // 2
+        self.__stop = self.__start
+        self.__extent = 0
+
+    def __reserve(self, front, back):
+        capacity = len(self.__keys)
+        if front <= self.__start and back <= capacity - self.__stop: return
+        size = len(self)
+        capacity = max(2 * capacity, 2 * (size + front + back))
+        start = front + (capacity - size - front - back) // 2
+        segments, keys = np.empty((capacity, 2, 2)), np.empty(capacity)
+        segments[start:start + size] = self.get_data()
+        keys[start:start + size] = self.get_keys()
+        self.__segments, self.__keys = segments, keys
+        self.__start, self.__stop = start, start + size
+    def __prepare(self, segments):
+        segments = np.asarray(segments, dtype = float).reshape(-1, 2, 2)
+        keys = segments[:, :, 0].min(axis = 1)
+        order = np.argsort(keys, kind = 'stable')
+        if len(segments) > 0:
+            self.__extent = max(self.__extent, np.ptp(segments[:, :, 0], axis = 1).max())
+        return (segments[order], keys[order])
+    def __sort(self):
+        order = np.argsort(self.get_keys(), kind = 'stable')
+        self.__segments[self.__start:self.__stop] = self.get_data()[order]
+        self.__keys[self.__start:self.__stop] = self.get_keys()[order]
+
+    def prepend(self, segments):
+        segments, keys = self.__prepare(segments)
+        if len(keys) == 0: return
+        self.__reserve(len(keys), 0)
+        start = self.__start - len(keys)
+        self.__segments[start:self.__start] = segments
+        self.__keys[start:self.__start] = keys
+        unsorted = len(self) > 0 and keys[-1] > self.__keys[self.__start]
+        self.__start = start
+        if unsorted: self.__sort()
+    def append(self, segments):
+        segments, keys = self.__prepare(segments)
+        if len(keys) == 0: return
+        self.__reserve(0, len(keys))
+        stop = self.__stop + len(keys)
+        self.__segments[self.__stop:stop] = segments
+        self.__keys[self.__stop:stop] = keys
+        unsorted = len(self) > 0 and keys[0] < self.__keys[self.__stop - 1]
+        self.__stop = stop
+        if unsorted: self.__sort()
+    def clear(self):
+        self.__start = len(self.__keys) // 2
+        self.__stop = self.__start
+        self.__extent = 0
+
+    def query(self, xlim, ylim):
+        lo = np.searchsorted(self.get_keys(), xlim[0] - self.__extent, 'left')
+        hi = np.searchsorted(self.get_keys(), xlim[1], 'right')
+        window = self.get_data()[lo:hi]
+        x, y = window[:, :, 0], window[:, :, 1]
+        with np.errstate(invalid = 'ignore'):
+            inside = (x >= xlim[0]) & (x <= xlim[1]) & (y >= ylim[0]) & (y <= ylim[1])
+        mask = inside.any(axis = 1)
+        return window if mask.all() else window[mask]
+
+    def get_data(self):
+        return self.__segments[self.__start:self.__stop]
+    def get_keys(self):
+        return self.__keys[self.__start:self.__stop]
+    def get_extent(self):
+        return self.__extent
+
+    def __len__(self):
+        return self.__stop - self.__start
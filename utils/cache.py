@@ -0,0 +1,257 @@
+import ast
+import hashlib
+import importlib
+from collections import OrderedDict
+
+import sympy as sy
+from sympy.core.function import AppliedUndef
+
+from utils.files import FileManager
+
+class SerialiserError(Exception):
+
+    def __init__(self, m):
+        self.__message = m
+        super().__init__(self.__str__())
+
+    def __str__(self):
+        return str(self.__message)
+
+class Serialiser:
+
+    NAMESPACE_MODULES = ('sympy', 'sympy.core', 'sympy.functions.elementary.piecewise',
+        'sympy.functions.elementary.miscellaneous')
+    CALLABLES = { "set" : set }
+    NAMED_TYPES = (sy.Symbol, sy.Float)
+    CONSTANT_TYPES = (int, float, bool, type(None))
+
+    __namespace = None
+
+    @staticmethod
+    def dumps(value):
+        if isinstance(value, dict):
+            items = [Serialiser.dumps(k) + " : " + Serialiser.dumps(v) for (k, v) in value.items()]
+            return "{" + ", ".join(items) + "}"
+        if isinstance(value, (set, frozenset)):
+            return "set([" + ", ".join(map(Serialiser.dumps, value)) + "])"
+        if isinstance(value, list):
+            return "[" + ", ".join(map(Serialiser.dumps, value)) + "]"
+        if isinstance(value, tuple):
+            return "(" + "".join([Serialiser.dumps(v) + ", " for v in value]) + ")"
+        return sy.srepr(value)
+    @staticmethod
+    def loads(text):
+        try:
+            return Serialiser.__load(ast.parse(text.strip(), mode = "eval").body, True)
+        except (SyntaxError, ValueError, RecursionError) as e:
+            raise SerialiserError("Could not read serialised value.") from e
+
+    @staticmethod
+    def get_namespace():
+        if Serialiser.__namespace is None:
+            namespace = {}
+            for m in map(importlib.import_module, Serialiser.NAMESPACE_MODULES):
+                for n in dir(m):
+                    v = getattr(m, n)
+                    if Serialiser.__is_basic(v) or Serialiser.__is_type(v):
+                        namespace.setdefault(n, v)
+            for c in Serialiser.__get_types():
+                namespace.setdefault(c.__name__, c)
+            Serialiser.__namespace = namespace
+        return Serialiser.__namespace
+    @staticmethod
+    def __get_types():
+        pending, types = [sy.Basic], set()
+        while len(pending) > 0:
+            for c in type.__subclasses__(pending.pop()):
+                if c not in types and not issubclass(c, AppliedUndef):
+                    types.add(c)
+                    pending.append(c)
+        return sorted(types, key = lambda c : (c.__module__, c.__name__))
+    @staticmethod
+    def __is_basic(value):
+        return isinstance(value, sy.Basic)
+    @staticmethod
+    def __is_type(value):
+        return isinstance(value, type) and issubclass(value, sy.Basic)
+    @staticmethod
+    def __load(node, strings = False):
+        if isinstance(node, ast.Constant) and (type(node.value) in Serialiser.CONSTANT_TYPES \
+            or (strings and isinstance(node.value, str))):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            value = Serialiser.__load(node.operand)
+            if isinstance(value, (int, float, sy.Basic)) and not isinstance(value, bool):
+                return -value
+        load = lambda n : Serialiser.__load(n, strings)
+        if isinstance(node, ast.Tuple):
+            return tuple(map(load, node.elts))
+        if isinstance(node, ast.List):
+            return list(map(load, node.elts))
+        if isinstance(node, ast.Dict) and None not in node.keys:
+            return dict(zip(map(load, node.keys), map(load, node.values)))
+        if isinstance(node, ast.Name) and node.id in Serialiser.get_namespace():
+            return Serialiser.get_namespace()[node.id]
+        if isinstance(node, ast.Call):
+            return Serialiser.__call(node)
+        raise SerialiserError("Unexpected serialised " + type(node).__name__ + ".")
+    @staticmethod
+    def __call(node):
+        if isinstance(node.func, ast.Name) and node.func.id in Serialiser.CALLABLES:
+            func = Serialiser.CALLABLES[node.func.id]
+        else:
+            func = Serialiser.__load(node.func)
+            if not Serialiser.__is_type(func):
+                raise SerialiserError("Unexpected serialised call.")
+        named = func is sy.Function or issubclass(func, Serialiser.NAMED_TYPES)
+        args = []
+        for (i, a) in enumerate(node.args):
+            if named and i == 0 and isinstance(a, ast.Constant) and isinstance(a.value, str):
+                args.append(a.value)
+            else:
+                args.append(Serialiser.__load(a))
+        if any(k.arg is None for k in node.keywords):
+            raise SerialiserError("Unexpected serialised keywords.")
+        kwargs = dict((k.arg, Serialiser.__load(k.value)) for k in node.keywords)
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            raise SerialiserError("Could not rebuild " + str(getattr(func, '__name__', func))
+                + ".") from e
+
+class DiskStore:
+
+    def __init__(self, name, capacity, persistent = True):
+        self.__name = name
+        self.__capacity = capacity
+        self.__persistent = persistent
+        self.__entries = None
+
+    def __get_entries(self):
+        if self.__persistent and self.__entries is None:
+            try:
+                files = FileManager.get_instance()
+                entries = list(files.load_file(self.__name, {}).items())
+                self.__entries = OrderedDict(entries[max(0, len(entries) - self.__capacity):])
+                files.overwrite_file(self.__name, self.__entries)
+            except Exception:
+                self.__persistent = False
+        return self.__entries if self.__persistent else None
+
+    def get(self, digest):
+        entries = self.__get_entries()
+        return None if entries is None else entries.get(digest)
+    def put(self, digest, text):
+        entries = self.__get_entries()
+        if entries is None: return
+        entries.pop(digest, None)
+        entries[digest] = text
+        while len(entries) > self.__capacity: entries.popitem(last = False)
+        try:
+            FileManager.get_instance().append_file(self.__name, { digest : text })
+        except Exception:
+            self.__persistent = False
+    def remove(self, digest):
+        entries = self.__get_entries()
+        if entries is not None: entries.pop(digest, None)
+
+    def is_persistent(self):
+        return self.__persistent
+    def set_persistent(self, persistent):
+        self.__persistent = persistent
+    def __len__(self):
+        entries = self.__get_entries()
+        return 0 if entries is None else len(entries)
+
+class LRUCache:
+
+    def __init__(self, capacity, weigher = None):
+        if capacity < 1:
+            raise ValueError("LRUCache capacity must be positive.")
+        self.__capacity = capacity
+        self.__weigher = weigher
+        self.__weight = 0
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __weigh(self, value):
+        return 1 if self.__weigher is None else self.__weigher(value)
+
+    def get(self, key, default = None):
+        if key in self.__entries:
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+        self.__misses += 1
+        return default
+    def put(self, key, value):
+        self.remove(key)
+        self.__entries[key] = value
+        self.__weight += self.__weigh(value)
+        while self.__weight > self.__capacity and len(self.__entries) > 1:
+            self.__weight -= self.__weigh(self.__entries.popitem(last = False)[1])
+    def remove(self, key):
+        if key in self.__entries:
+            self.__weight -= self.__weigh(self.__entries.pop(key))
+    def clear(self):
+        self.__entries.clear()
+        self.__weight = 0
+
+    def get_hits(self):
+        return self.__hits
+    def get_misses(self):
+        return self.__misses
+    def get_stats(self):
+        return {
+            "hits" : self.__hits,
+            "misses" : self.__misses,
+            "size" : len(self.__entries),
+            "weight" : self.__weight,
+            "capacity" : self.__capacity
+        }
+
+    def __contains__(self, key):
+        return key in self.__entries
+    def __len__(self):
+        return len(self.__entries)
+
+class SolveCache(LRUCache):
+
+    FILE_NAME = "solves"
+    DISK_SIZE = 1024
+    REVISION = 1
+
+    def __init__(self, capacity, persistent = True):
+        super().__init__(capacity)
+        self.__disk = DiskStore(SolveCache.FILE_NAME, SolveCache.DISK_SIZE, persistent)
+
+    @staticmethod
+    def key(method, expr, sym, domain):
+        return (method, sy.srepr(expr), sy.srepr(sym), sy.srepr(domain))
+    @staticmethod
+    def __digest(key):
+        parts = key + (sy.__version__, str(SolveCache.REVISION))
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key, default = None):
+        value = super().get(key)
+        if value is not None: return value
+        digest = SolveCache.__digest(key)
+        text = self.__disk.get(digest)
+        if text is None: return default
+        try:
+            value = Serialiser.loads(text)
+        except SerialiserError:
+            self.__disk.remove(digest)
+            return default
+        super().put(key, value)
+        return value
+    def put(self, key, value):
+        super().put(key, value)
+        self.__disk.put(SolveCache.__digest(key), Serialiser.dumps(value))
+
+    def is_persistent(self):
+        return self.__disk.is_persistent()
+    def set_persistent(self, persistent):
+        self.__disk.set_persistent(persistent)
@@ -0,0 +1,58 @@
+import numpy as np
+
+class MarchingSquares:
+
+    PAIRS = np.array([(0, 0), (3, 0), (0, 1), (3, 1), (1, 2), (3, 0), (0, 2), (3, 2),
+        (2, 3), (0, 2), (3, 0), (1, 2), (3, 1), (0, 1), (3, 0), (0, 0)])
+    SEPARATE_AC = ((3, 0), (1, 2))
+    SEPARATE_BD = ((0, 1), (2, 3))
+
+    @staticmethod
+    def get_cases(v):
+        s = (v > 0).astype(int)
+        case = s[..., :-1, :-1] + 2 * s[..., :-1, 1:] + 4 * s[..., 1:, 1:] + 8 * s[..., 1:, :-1]
+        f = np.isfinite(v)
+        finite = f[..., :-1, :-1] & f[..., :-1, 1:] & f[..., 1:, 1:] & f[..., 1:, :-1]
+        return np.where(finite, case, 0)
+    @staticmethod
+    def get_cells(v, spread = 0):
+        case = MarchingSquares.get_cases(v)
+        mask = (case != 0) & (case != 15)
+        for _ in range(spread):
+            grown = mask.copy()
+            grown[..., 1:, :] |= mask[..., :-1, :]
+            grown[..., :-1, :] |= mask[..., 1:, :]
+            grown[..., :, 1:] |= mask[..., :, :-1]
+            grown[..., :, :-1] |= mask[..., :, 1:]
+            mask = grown
+        return np.nonzero(mask)
+
+    @staticmethod
+    def get_segments(x, y, v):
+        case = MarchingSquares.get_cases(v)
+        k, j, i = np.nonzero((case != 0) & (case != 15))
+        case = case[k, j, i]
+        a, b, c, d = v[k, j, i], v[k, j, i + 1], v[k, j + 1, i + 1], v[k, j + 1, i]
+        x0, x1, y0, y1 = x[k, i], x[k, i + 1], y[k, j], y[k, j + 1]
+        with np.errstate(all = 'ignore'):
+            points = np.stack((
+                np.stack((x0 + a / (a - b) * (x1 - x0), y0), axis = -1),
+                np.stack((x1, y0 + b / (b - c) * (y1 - y0)), axis = -1),
+                np.stack((x0 + d / (d - c) * (x1 - x0), y1), axis = -1),
+                np.stack((x0, y0 + a / (a - d) * (y1 - y0)), axis = -1)), axis = 1)
+        centre = (a + b + c + d) / 4
+        separate_bd = ((case == 5) & (centre > 0)) | ((case == 10) & (centre <= 0))
+        separate_ac = ((case == 5) & (centre <= 0)) | ((case == 10) & (centre > 0))
+        first = MarchingSquares.PAIRS[case]
+        first[separate_bd] = MarchingSquares.SEPARATE_BD[0]
+        first[separate_ac] = MarchingSquares.SEPARATE_AC[0]
+        second = np.zeros_like(first)
+        second[separate_bd] = MarchingSquares.SEPARATE_BD[1]
+        second[separate_ac] = MarchingSquares.SEPARATE_AC[1]
+        saddle = separate_ac | separate_bd
+        n = np.arange(len(case))
+        segments = np.concatenate((
+            np.stack((points[n, first[:, 0]], points[n, first[:, 1]]), axis = 1),
+            np.stack((points[n, second[:, 0]], points[n, second[:, 1]]), axis = 1)[saddle]))
+        scale = np.max(np.abs(np.stack((a, b, c, d))), axis = 0)
+        return (segments, np.concatenate((scale, scale[saddle])))
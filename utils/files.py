@@ -52,6 +52,15 @@ class FileManager:
             return default
         return self.__file_to_dict(path, default)
 
+    def append_file(self, name, content):
+        self.__append_file(self.get_files_path(name), content)
+    def __append_file(self, path, content):
+        if not self.__exists(path):
+            self.__mkdirs(path)
+        with open(path, 'a+') as file:
+            for (x, y) in content.items():
+                file.write(str(x) + FileManager.DELIM + str(y) + "\n")
+
     def overwrite_file(self, name, content):
         self.__overwrite_file(self.get_files_path(name), content)
     def __overwrite_file(self, path, content):
@@ -0,0 +1,87 @@
+from collections import deque
+
+class DependencyGraph:
+
+    def __init__(self):
+        self.__provides = {}
+        self.__requires = {}
+        self.__providers = {}
+        self.__dependents = {}
+
+    def copy(self):
+        graph = DependencyGraph()
+        graph.__provides = dict(self.__provides)
+        graph.__requires = dict(self.__requires)
+        graph.__providers = dict((n, set(k)) for (n, k) in self.__providers.items())
+        graph.__dependents = dict((n, set(k)) for (n, k) in self.__dependents.items())
+        return graph
+    def clear(self):
+        for d in [self.__provides, self.__requires, self.__providers, self.__dependents]:
+            d.clear()
+
+    def add(self, key, provides, requires):
+        self.remove(key)
+        self.__provides[key] = frozenset(provides)
+        self.__requires[key] = frozenset(requires)
+        for n in self.__provides[key]: self.__providers.setdefault(n, set()).add(key)
+        for n in self.__requires[key]: self.__dependents.setdefault(n, set()).add(key)
+    def remove(self, key):
+        for n in self.__provides.pop(key, ()): DependencyGraph.__discard(self.__providers, n, key)
+        for n in self.__requires.pop(key, ()): DependencyGraph.__discard(self.__dependents, n, key)
+    @staticmethod
+    def __discard(index, name, key):
+        keys = index.get(name)
+        if keys is None: return
+        keys.discard(key)
+        if len(keys) == 0: del index[name]
+
+    def get_provides(self, key):
+        return self.__provides.get(key, frozenset())
+    def get_requires(self, key):
+        return self.__requires.get(key, frozenset())
+    def get_providers(self, name):
+        return set(self.__providers.get(name, ()))
+    def get_dependents(self, name):
+        return set(self.__dependents.get(name, ()))
+
+    def get_affected(self, names):
+        pending = deque(names)
+        seen = set(pending)
+        keys = set()
+        while len(pending) > 0:
+            name = pending.popleft()
+            for k in self.__providers.get(name, set()) | self.__dependents.get(name, set()):
+                if k in keys: continue
+                keys.add(k)
+                for n in self.__provides[k]:
+                    if n not in seen:
+                        seen.add(n)
+                        pending.append(n)
+        return keys
+
+    def order(self, keys):
+        keys = list(keys)
+        members = set(keys)
+        edges = dict((k, []) for k in keys)
+        degree = dict((k, 0) for k in keys)
+        for k in keys:
+            for n in self.__requires.get(k, ()):
+                for p in self.__providers.get(n, ()):
+                    if p in members and p is not k:
+                        edges[p].append(k)
+                        degree[k] += 1
+        ready = deque(k for k in keys if degree[k] == 0)
+        ordered = []
+        while len(ready) > 0:
+            k = ready.popleft()
+            ordered.append(k)
+            for d in edges[k]:
+                degree[d] -= 1
+                if degree[d] == 0: ready.append(d)
+        done = set(ordered)
+        return ordered + [k for k in keys if k not in done]
+
+    def __contains__(self, key):
+        return key in self.__provides
+    def __len__(self):
+        return len(self.__provides)
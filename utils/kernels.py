@@ -0,0 +1,305 @@
+import math
+import functools
+
+import numpy as np
+import sympy as sy
+from sympy.core.containers import Tuple
+from sympy.printing.pycode import NumPyPrinter
+
+from utils.cache import LRUCache
+
+class KernelError(Exception):
+
+    def __init__(self, m):
+        self.__message = m
+        super().__init__(self.__str__())
+
+    def __str__(self):
+        return str(self.__message)
+
+class VectorisedMath:
+
+    def __getattr__(self, name):
+        func = getattr(math, name)
+        def evaluate(*args):
+            try:
+                return func(*args)
+            except (ValueError, ArithmeticError):
+                return np.nan
+        return np.vectorize(evaluate, otypes = [float])
+
+class VectorisedSympy:
+
+    def __getattr__(self, name):
+        func = getattr(sy, name)
+        def evaluate(*args):
+            try:
+                return complex(func(*args).evalf())
+            except (TypeError, ValueError, ArithmeticError):
+                return np.nan
+        return np.vectorize(evaluate, otypes = [complex])
+
+class NumericCalculus:
+
+    ORDER = 8
+    PANELS = 16
+    MAX_POINTS = 4096
+    NODES, WEIGHTS = np.polynomial.legendre.leggauss(ORDER)
+
+    @staticmethod
+    def derivative(f, x, n):
+        x = np.asarray(x, dtype = float)
+        h = np.finfo(float).eps ** (1 / (n + 2)) * np.maximum(1, np.abs(x))
+        total = 0
+        for k in range(n + 1):
+            total = total + (-1) ** k * math.comb(n, k) * f(x + (n / 2 - k) * h)
+        return total / h ** n
+
+    @staticmethod
+    def __map(u, a, b):
+        fa, fb = np.isfinite(a), np.isfinite(b)
+        t = 2 * u - 1
+        s = np.where(fa & fb, a + (b - a) * u, np.where(fa, a + u / (1 - u),
+            np.where(fb, b - (1 - u) / u, t / (1 - t * t))))
+        jacobian = np.where(fa & fb, b - a, np.where(fa, 1 / (1 - u) ** 2,
+            np.where(fb, 1 / u ** 2, 2 * (1 + t * t) / (1 - t * t) ** 2)))
+        return s, jacobian
+    @staticmethod
+    def integral(f, a, b, *args, panels = PANELS):
+        a, b, *args = np.broadcast_arrays(np.asarray(a, dtype = float),
+            np.asarray(b, dtype = float), *(np.asarray(v) for v in args))
+        shape = (-1,) + (1,) * a.ndim
+        u = (np.arange(panels)[:, None] + (NumericCalculus.NODES + 1) / 2) / panels
+        w = np.tile(NumericCalculus.WEIGHTS / (2 * panels), panels)
+        s, jacobian = NumericCalculus.__map(u.reshape(shape), a, b)
+        return np.sum(w.reshape(shape) * jacobian * f(s, *args), axis = 0)
+    @staticmethod
+    def antiderivative(f, x, *args):
+        x = np.asarray(x, dtype = float)
+        if any(np.size(a) > 1 for a in args):
+            return NumericCalculus.integral(f, 0, x, *args)
+        finite = np.isfinite(x)
+        points = np.unique(np.append(x[finite], 0.0))
+        result = np.full(x.shape, np.nan)
+        if len(points) < 2:
+            result[finite] = 0
+            return result
+        step = max((points[-1] - points[0]) / NumericCalculus.MAX_POINTS,
+            np.median(np.diff(points)))
+        points = np.union1d(points, np.arange(points[0], points[-1], step))
+        segments = NumericCalculus.integral(f, points[:-1], points[1:], *args, panels = 1)
+        total = np.concatenate(([0.0], np.cumsum(segments)))
+        total -= total[np.searchsorted(points, 0.0)]
+        result[finite] = total[np.searchsorted(points, x[finite])]
+        return result
+
+class KernelPrinter(NumPyPrinter):
+
+    MAX_POWER = 4
+
+    def __init__(self):
+        super().__init__({ "fully_qualified_modules" : True, "inline" : True, "human" : False })
+
+    def doprint(self, expr, assign_to = None):
+        _, unsupported, printed = super().doprint(expr, assign_to)
+        if len(unsupported) > 0:
+            names = sorted(set(type(e).__name__ for e in unsupported))
+            raise KernelError("Unsupported: " + ", ".join(names) + ".")
+        return printed
+    def _print_not_supported(self, expr):
+        name = type(expr).__name__
+        if not isinstance(expr, sy.Function) or getattr(sy, name, None) is not type(expr):
+            return super()._print_not_supported(expr)
+        return "sympy.%s(%s)" % (name, ", ".join(map(self._print, expr.args)))
+    def _print_sec(self, expr):
+        return "(1/numpy.cos(%s))" % self._print(expr.args[0])
+    def _print_csc(self, expr):
+        return "(1/numpy.sin(%s))" % self._print(expr.args[0])
+    def _print_cot(self, expr):
+        return "(1/numpy.tan(%s))" % self._print(expr.args[0])
+    def _print_factorial(self, expr):
+        return "math.gamma(%s + 1)" % self._print(expr.args[0])
+    def _print_Max(self, expr):
+        return functools.reduce(lambda a, b : "numpy.maximum(%s, %s)" % (a, b),
+            map(self._print, expr.args))
+    def _print_Min(self, expr):
+        return functools.reduce(lambda a, b : "numpy.minimum(%s, %s)" % (a, b),
+            map(self._print, expr.args))
+    def _print_Pow(self, expr, rational = False):
+        base, exp = expr.as_base_exp()
+        if isinstance(base, sy.Symbol) and exp.is_Integer \
+            and 2 <= abs(exp) <= KernelPrinter.MAX_POWER:
+            product = "*".join([self._print(base)] * abs(int(exp)))
+            return "(" + product + ")" if exp > 0 else "(1/(" + product + "))"
+        return super()._print_Pow(expr, rational = rational)
+    def _print_Derivative(self, expr):
+        printed = self._print(expr.expr)
+        for (v, n) in expr.variable_count:
+            s = self._print(v)
+            printed = "calculus.derivative(lambda %s : %s, %s, %d)" % (s, printed, s, n)
+        return printed
+    def _print_Integral(self, expr):
+        printed = self._print(expr.function)
+        for i, l in enumerate(expr.limits):
+            inner = sy.Integral(expr.function, *expr.limits[:i]) if i > 0 else expr.function
+            names = [self._print(l[0])] + sorted(map(self._print, inner.free_symbols - {l[0]}))
+            if len(l) == 3:
+                printed = "calculus.integral(lambda %s : %s, %s)" % (", ".join(names), printed,
+                    ", ".join([self._print(l[1]), self._print(l[2])] + names[1:]))
+            else:
+                printed = "calculus.antiderivative(lambda %s : %s, %s)" \
+                    % (", ".join(names), printed, ", ".join(names))
+        return printed
+
+class KernelOptimiser:
+
+    MIN_HORNER_TERMS = 3
+
+    def __init__(self, exprs, gens):
+        self.__gens = tuple(gens)
+        self.__temps = []
+        self.__exprs = list(exprs)
+        self.__before = self.__count(self.__exprs)
+        calculus = self.__calculus(exprs)
+        exprs = [e.xreplace(dict((a, c) for (c, a) in calculus)) for e in exprs]
+        self.__exprs = exprs
+        try:
+            exprs = list(map(self.__horner, exprs))
+            bases = self.__power_bases(exprs)
+            self.__temps, reduced = sy.cse(exprs + bases, symbols = sy.numbered_symbols("_t"))
+            self.__exprs = reduced[:len(exprs)]
+        except Exception:
+            self.__temps = []
+        self.__temps = calculus + self.__temps
+        self.__after = self.__count([v for (_, v) in self.__temps] + self.__exprs)
+
+    def __count(self, exprs):
+        return sum(map(sy.count_ops, exprs))
+    def __calculus(self, exprs):
+        atoms = set().union(*[e.atoms(sy.Derivative, sy.Integral) for e in exprs])
+        outer = [a for a in atoms if not any(a != b and b.has(a) for b in atoms)]
+        return list(zip(sy.numbered_symbols("_c"), sorted(outer, key = sy.default_sort_key)))
+    def __horner(self, expr):
+        if not isinstance(expr, sy.Basic) or expr.is_Atom: return expr
+        if expr.is_Add and len(expr.args) >= KernelOptimiser.MIN_HORNER_TERMS \
+            and expr.is_polynomial(*self.__gens):
+            gens = [g for g in self.__gens if g in expr.free_symbols]
+            if len(gens) > 0:
+                h = sy.horner(expr, *gens)
+                if sy.count_ops(h) < sy.count_ops(expr): return h
+        args = list(map(self.__horner, expr.args))
+        return expr if args == list(expr.args) else expr.func(*args)
+    def __power_bases(self, exprs):
+        bases = set()
+        for e in exprs:
+            for p in e.atoms(sy.Pow):
+                base, exp = p.as_base_exp()
+                if exp.is_Integer and 2 <= abs(exp) <= KernelPrinter.MAX_POWER \
+                    and not isinstance(base, sy.Symbol):
+                    bases.add(base)
+        return list(bases)
+
+    def get_temporaries(self):
+        return self.__temps
+    def get_exprs(self):
+        return self.__exprs
+    def get_op_counts(self):
+        return (self.__before, self.__after)
+
+class Kernel:
+
+    NAME = "_kernel"
+    IMAG_TOLERANCE = 1e-9
+
+    def __init__(self, args, body):
+        self.__args = tuple(args)
+        self.__body = Kernel.freeze(body)
+        self.__is_tuple = isinstance(self.__body, tuple)
+        self.__names = ["_" + str(i) for i in range(len(self.__args))]
+        self.__temporaries, self.__exprs, self.__op_counts = self.__optimise()
+        self.__source = self.__generate()
+        namespace = { "numpy" : np, "math" : VectorisedMath(), "sympy" : VectorisedSympy(),
+            "calculus" : NumericCalculus }
+        try:
+            exec(compile(self.__source, "<" + Kernel.NAME + ">", "exec"), namespace)
+        except SyntaxError as e:
+            raise KernelError("Could not compile kernel.") from e
+        self.__func = namespace[Kernel.NAME]
+
+    @staticmethod
+    def freeze(body):
+        if isinstance(body, (list, tuple, Tuple)):
+            return tuple(body)
+        return body
+    @staticmethod
+    def key(args, body):
+        return (tuple(args), Kernel.freeze(body))
+
+    def __optimise(self):
+        mapping = dict(zip(self.__args, map(sy.Symbol, self.__names)))
+        exprs = self.__body if self.__is_tuple else (self.__body,)
+        exprs = [sy.sympify(e).xreplace(mapping) for e in exprs]
+        optimiser = KernelOptimiser(exprs, mapping.values())
+        return ([tuple(t) for t in optimiser.get_temporaries()], list(optimiser.get_exprs()),
+            optimiser.get_op_counts())
+    def __generate(self):
+        printer = KernelPrinter()
+        lines = ["def " + Kernel.NAME + "(" + ", ".join(self.__names) + "):"]
+        for (t, v) in self.__temporaries:
+            lines.append("    " + str(t) + " = " + printer.doprint(v))
+        printed = list(map(printer.doprint, self.__exprs))
+        result = "(" + ", ".join(printed) + ",)" if self.__is_tuple else printed[0]
+        lines.append("    return " + result)
+        return "\n".join(lines) + "\n"
+
+    def __real(self, value, shape):
+        value = np.asarray(value)
+        if np.iscomplexobj(value):
+            value = np.where(np.abs(value.imag) > Kernel.IMAG_TOLERANCE, np.nan, value.real)
+        return np.array(np.broadcast_to(value, shape), dtype = float)
+    def __call__(self, *args):
+        args = [np.asarray(a, dtype = float) for a in args]
+        shape = np.broadcast(*args).shape if len(args) > 0 else ()
+        with np.errstate(all = 'ignore'):
+            result = self.__func(*args)
+        if self.__is_tuple:
+            return tuple(self.__real(r, shape) for r in result)
+        return self.__real(result, shape)
+
+    def get_args(self):
+        return self.__args
+    def get_body(self):
+        return self.__body
+    def get_source(self):
+        return self.__source
+    def get_op_counts(self):
+        return self.__op_counts
+
+class KernelManager:
+
+    __instance = None
+
+    CACHE_SIZE = 128
+
+    @staticmethod
+    def get_instance():
+        if KernelManager.__instance is None:
+            raise Exception("No instance of KernelManager.")
+        return KernelManager.__instance
+
+    def __init__(self):
+        if KernelManager.__instance is not None:
+            raise Exception("Invalid initialistion of KernelManager.")
+        KernelManager.__instance = self
+        self.__kernels = LRUCache(KernelManager.CACHE_SIZE)
+
+    def get_kernel(self, args, body):
+        key = Kernel.key(args, body)
+        kernel = self.__kernels.get(key)
+        if kernel is None:
+            kernel = Kernel(args, body)
+            self.__kernels.put(key, kernel)
+        return kernel
+
+    def get_stats(self):
+        return self.__kernels.get_stats()
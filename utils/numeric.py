@@ -0,0 +1,62 @@
+import io
+import ast
+import math
+import operator
+import tokenize
+
+class NumericEvaluator:
+
+    BINARY_OPERATORS = {
+        ast.Add : operator.add,
+        ast.Sub : operator.sub,
+        ast.Mult : operator.mul,
+        ast.Div : operator.truediv,
+        ast.Mod : operator.mod,
+        ast.Pow : operator.pow
+    }
+    UNARY_OPERATORS = {
+        ast.UAdd : operator.pos,
+        ast.USub : operator.neg
+    }
+    CONSTANTS = { "pi" : math.pi, "e" : math.e, "E" : math.e }
+    FUNCTIONS = {
+        "sin" : math.sin, "cos" : math.cos, "tan" : math.tan,
+        "asin" : math.asin, "acos" : math.acos, "atan" : math.atan,
+        "sinh" : math.sinh, "cosh" : math.cosh, "tanh" : math.tanh,
+        "sqrt" : math.sqrt, "exp" : math.exp, "ln" : math.log,
+        "log" : lambda x, b = math.e : math.log(x, b),
+        "Abs" : abs, "abs" : abs, "floor" : math.floor, "ceiling" : math.ceil
+    }
+
+    @staticmethod
+    def evaluate(text):
+        try:
+            value = NumericEvaluator.__eval(ast.parse(NumericEvaluator.__convert_xor(text),
+                mode = "eval").body)
+            return float(value) if math.isfinite(value) else None
+        except (SyntaxError, ValueError, TypeError, ArithmeticError, RecursionError,
+            tokenize.TokenError):
+            return None
+
+    @staticmethod
+    def __convert_xor(text):
+        tokens = tokenize.generate_tokens(io.StringIO(text.strip()).readline)
+        return tokenize.untokenize((t.type, "**" if t.type == tokenize.OP and t.string == "^"
+            else t.string) for t in tokens)
+
+    @staticmethod
+    def __eval(node):
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            return float(node.value)
+        if isinstance(node, ast.BinOp) and type(node.op) in NumericEvaluator.BINARY_OPERATORS:
+            return NumericEvaluator.BINARY_OPERATORS[type(node.op)](
+                NumericEvaluator.__eval(node.left), NumericEvaluator.__eval(node.right))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in NumericEvaluator.UNARY_OPERATORS:
+            return NumericEvaluator.UNARY_OPERATORS[type(node.op)](
+                NumericEvaluator.__eval(node.operand))
+        if isinstance(node, ast.Name) and node.id in NumericEvaluator.CONSTANTS:
+            return NumericEvaluator.CONSTANTS[node.id]
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) \
+            and node.func.id in NumericEvaluator.FUNCTIONS and len(node.keywords) == 0:
+            return NumericEvaluator.FUNCTIONS[node.func.id](*map(NumericEvaluator.__eval, node.args))
+        raise ValueError("Unsupported numeric expression.")
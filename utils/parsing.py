@@ -1,21 +1,29 @@
-import copy
+import io
+import re
+import time
+import tokenize
+import importlib
 
 import numpy as np
 import sympy as sy
 from sympy.sets import Set
 from sympy.sets.conditionset import ConditionSet
+from sympy.calculus.util import continuous_domain
+from sympy.functions.elementary.trigonometric import TrigonometricFunction
 from sympy.integrals import Integral
 from sympy.core.function import UndefinedFunction, AppliedUndef, Derivative
-from sympy.parsing.sympy_parser import parse_expr
+from sympy.parsing.sympy_parser import stringify_expr, eval_expr, evaluateFalse
 from sympy.parsing.sympy_parser import standard_transformations, \
     function_exponentiation, convert_xor, convert_equals_signs
 from sympy.core.relational import Relational, GreaterThan, LessThan, StrictGreaterThan, \
     StrictLessThan, Equality, Unequality
 from sympy.core.containers import Tuple
 from sympy.logic.boolalg import BooleanFunction
-from sympy.core.compatibility import exec_
 
 from utils.maths import PlotType
+from utils.numeric import NumericEvaluator
+from utils.cache import LRUCache, SolveCache, Serialiser, SerialiserError
+from utils.worker import SymbolicWorker, WorkerError
 
 class ParsingError(Exception):
 
@@ -52,25 +60,104 @@ class Parser:
     FUNC_TYPES = (AppliedUndef, UndefinedFunction)
     SYMBOL_TYPES = (sy.Symbol, AppliedUndef, UndefinedFunction)
 
+    PARSE_CACHE_SIZE = 256
+    SOLVE_CACHE_SIZE = 256
+    TRANSFORM_BUDGET = 2.0
+    DOMAIN_BUDGET = 1.0
+    SYMMETRY_BUDGET = 1.0
+    CALCULUS_NAMES = ('der', 'int')
+
+    NAMESPACE_EXCLUSIONS = ('sympify', 'SympifyError', 'Subs', 'evalf', 'evaluate')
+    NAMESPACE_NAMES = {
+        'sympy.core' : (
+            'Add', 'AlgebraicNumber', 'Atom', 'AtomicExpr', 'Basic', 'Catalan', 'Derivative',
+            'Dict', 'Dummy', 'E', 'Eq', 'Equality', 'EulerGamma', 'Expr', 'Float', 'Function',
+            'FunctionClass', 'Ge', 'GoldenRatio', 'GreaterThan', 'Gt', 'I', 'Integer', 'Lambda',
+            'Le', 'LessThan', 'Lt', 'Mod', 'Mul', 'N', 'Ne', 'Number', 'NumberSymbol',
+            'PoleError', 'Pow', 'PrecisionExhausted', 'Rational', 'RealNumber', 'Rel', 'S',
+            'StrictGreaterThan', 'StrictLessThan', 'Symbol', 'TribonacciConstant', 'Tuple',
+            'Unequality', 'UnevaluatedExpr', 'Wild', 'WildFunction', 'arity', 'assumptions',
+            'cacheit', 'check_assumptions', 'common_assumptions', 'comp', 'count_ops', 'diff',
+            'expand', 'expand_complex', 'expand_func', 'expand_log', 'expand_mul',
+            'expand_multinomial', 'expand_power_base', 'expand_power_exp', 'expand_trig',
+            'factor_nc', 'factor_terms', 'failing_assumptions', 'gcd_terms', 'igcd', 'ilcm',
+            'integer_log', 'integer_nthroot', 'mod_inverse', 'nan', 'nfloat', 'oo', 'pi',
+            'preorder_traversal', 'prod', 'seterr', 'symbols', 'var', 'vectorize', 'zoo'),
+        'sympy.functions' : (
+            'Abs', 'Chi', 'Ci', 'DiracDelta', 'E1', 'Ei', 'Eijk', 'FallingFactorial',
+            'Heaviside', 'Id', 'KroneckerDelta', 'LambertW', 'LeviCivita', 'Li', 'Max', 'Min',
+            'Piecewise', 'RisingFactorial', 'Shi', 'Si', 'SingularityFunction', 'Ynm', 'Ynm_c',
+            'Znm', 'acos', 'acosh', 'acot', 'acoth', 'acsc', 'acsch', 'adjoint', 'airyai',
+            'airyaiprime', 'airybi', 'airybiprime', 'appellf1', 'arg', 'asec', 'asech', 'asin',
+            'asinh', 'assoc_laguerre', 'assoc_legendre', 'atan', 'atan2', 'atanh', 'bell',
+            'bernoulli', 'besseli', 'besselj', 'besselk', 'bessely', 'beta', 'binomial',
+            'bspline_basis', 'bspline_basis_set', 'carmichael', 'catalan', 'cbrt', 'ceiling',
+            'chebyshevt', 'chebyshevt_root', 'chebyshevu', 'chebyshevu_root', 'conjugate',
+            'cos', 'cosh', 'cot', 'coth', 'csc', 'csch', 'digamma', 'dirichlet_eta',
+            'elliptic_e', 'elliptic_f', 'elliptic_k', 'elliptic_pi', 'erf', 'erf2', 'erf2inv',
+            'erfc', 'erfcinv', 'erfi', 'erfinv', 'euler', 'exp', 'exp_polar', 'expint',
+            'factorial', 'factorial2', 'ff', 'fibonacci', 'floor', 'frac', 'fresnelc',
+            'fresnels', 'gamma', 'gegenbauer', 'genocchi', 'hankel1', 'hankel2', 'harmonic',
+            'hermite', 'hn1', 'hn2', 'hyper', 'im', 'interpolating_spline', 'jacobi',
+            'jacobi_normalized', 'jn', 'jn_zeros', 'laguerre', 'legendre', 'lerchphi', 'li',
+            'ln', 'log', 'loggamma', 'lowergamma', 'lucas', 'marcumq', 'mathieuc',
+            'mathieucprime', 'mathieus', 'mathieusprime', 'meijerg', 'multigamma', 'partition',
+            'periodic_argument', 'piecewise_fold', 'polar_lift', 'polarify', 'polygamma',
+            'polylog', 'principal_branch', 're', 'real_root', 'rf', 'root', 'sec', 'sech',
+            'sign', 'sin', 'sinc', 'sinh', 'sqrt', 'stieltjes', 'subfactorial', 'tan', 'tanh',
+            'transpose', 'tribonacci', 'trigamma', 'unbranched_argument', 'unpolarify',
+            'uppergamma', 'yn', 'zeta'),
+        'sympy.integrals' : (
+            'CosineTransform', 'FourierTransform', 'HankelTransform', 'Integral',
+            'InverseCosineTransform', 'InverseFourierTransform', 'InverseHankelTransform',
+            'InverseLaplaceTransform', 'InverseMellinTransform', 'InverseSineTransform',
+            'LaplaceTransform', 'MellinTransform', 'SineTransform', 'cosine_transform',
+            'fourier_transform', 'hankel_transform', 'integrate', 'inverse_cosine_transform',
+            'inverse_fourier_transform', 'inverse_hankel_transform',
+            'inverse_laplace_transform', 'inverse_mellin_transform', 'inverse_sine_transform',
+            'laplace_transform', 'line_integrate', 'mellin_transform', 'sine_transform',
+            'singularityintegrate') }
+    NAMESPACE_EAGER = ('Add', 'Mul', 'Pow', 'Or', 'And', 'Not')
+    NAME_PATTERN = re.compile(r"[A-Za-z_]\w*")
+
+    __name_index = None
+
     @staticmethod
     def get_instance():
         if Parser.__instance is None:
             raise Exception("No instance of Parser.")
         return Parser.__instance
 
-    def __init__(self):
+    @staticmethod
+    def run(method, *args):
+        result = getattr(Parser.get_instance(), method)(*map(Serialiser.loads, args))
+        return Serialiser.dumps(result)
+    @staticmethod
+    def submit(method, *args, budget = None):
+        args = map(Serialiser.dumps, args)
+        return SymbolicWorker.submit(Parser.run, method, *args, budget = budget)
+    @staticmethod
+    def result(task):
+        return Serialiser.loads(task.get_result())
+
+    @staticmethod
+    def get_name_index():
+        if Parser.__name_index is None:
+            Parser.__name_index = dict((n, m) for (m, names) in Parser.NAMESPACE_NAMES.items()
+                for n in names if n not in Parser.NAMESPACE_EXCLUSIONS)
+        return Parser.__name_index
+
+    def __init__(self, persistent = True):
         if Parser.__instance is not None:
             raise Exception("Invalid initialistion of Parser.")
         Parser.__instance = self
+        start = time.perf_counter()
         self.__transformations = standard_transformations \
             + (function_exponentiation, convert_xor, convert_equals_signs)
 
         self.__global_dict = {}
-        exec_('from sympy.core import *', self.__global_dict)
-        exec_('from sympy.functions import *', self.__global_dict)
-        exec_('from sympy.integrals import *', self.__global_dict)
-        exclusions = ['sympify', 'SympifyError', 'Subs', 'evalf', 'evaluate']
-        for e in exclusions: self.__global_dict.pop(e)
+        self.__resolve_time = 0
+        self.__resolve_names(Parser.NAMESPACE_EAGER)
 
         e, pi = sy.symbols('e pi')
         def func_check(name):
@@ -85,10 +172,30 @@ class Parser:
             (lambda x : isinstance(x, (Derivative, Integral)), lambda e : e.doit())]
         self.__invalid_atoms = (Derivative, Integral)
 
+        self.__parse_cache = LRUCache(Parser.PARSE_CACHE_SIZE)
+        self.__solve_cache = SolveCache(Parser.SOLVE_CACHE_SIZE, persistent)
+        self.__startup_time = time.perf_counter() - start
+
     def is_reserved(self, name):
         return str(name) in Parser.RESERVED_SYMBOLS
     def is_defined(self, name):
-        return self.is_reserved(name) or str(name) in self.__global_dict
+        return self.is_reserved(name) or str(name) in self.__global_dict \
+            or str(name) in Parser.get_name_index()
+
+    def __resolve_names(self, names):
+        start = time.perf_counter()
+        index = Parser.get_name_index()
+        for n in names:
+            if n not in self.__global_dict and n in index:
+                self.__global_dict[n] = getattr(importlib.import_module(index[n]), n)
+        self.__resolve_time += time.perf_counter() - start
+    def get_startup_stats(self):
+        return {
+            "construction" : self.__startup_time,
+            "resolution" : self.__resolve_time,
+            "loaded" : len(self.__global_dict),
+            "indexed" : len(Parser.get_name_index())
+        }
 
     def subs(self, expr, sb = None):
         if isinstance(expr, (tuple, Tuple)):
@@ -111,6 +218,27 @@ class Parser:
         except Exception as e:
             raise ParsingError("Parser.replace", e) from e
         return expr
+    def substitute(self, expr, sb):
+        if isinstance(expr, (tuple, Tuple)):
+            return tuple(map(lambda e : self.substitute(e, sb), expr))
+        if isinstance(expr, list):
+            return list(map(lambda e : self.substitute(e, sb), expr))
+        variables, functions = {}, {}
+        for (name, body) in sb:
+            if isinstance(name, Parser.VAR_TYPES):
+                variables[name] = body
+            elif isinstance(name, Parser.FUNC_TYPES):
+                functions[name] = body
+            else:
+                raise ParsingError("Parser.substitute", "Unexpected binding type.")
+        try:
+            if len(variables) > 0: expr = expr.xreplace(variables)
+            if len(functions) > 0:
+                expr = expr.replace(lambda e : isinstance(e, AppliedUndef) and e.func in functions,
+                    lambda e : functions[e.func](*e.args))
+        except Exception as e:
+            raise ParsingError("Parser.substitute", e) from e
+        return expr
     def transform(self, expr, tr = None):
         if isinstance(expr, (tuple, Tuple)):
             return tuple(map(lambda e : self.transform(e, tr), expr))
@@ -127,10 +255,17 @@ class Parser:
             expr = f(expr)
         return expr
 
-    def is_valid(self, expr):
+    def is_valid(self, expr, variables = ()):
         if isinstance(expr, (tuple, Tuple, list)):
-            return all(map(self.is_valid, expr))
-        return len(expr.atoms(*self.__invalid_atoms)) == 0
+            return all(map(lambda e : self.is_valid(e, variables), expr))
+        return all(map(lambda a : self.is_numeric(a, variables), expr.atoms(*self.__invalid_atoms)))
+    def is_numeric(self, atom, variables):
+        if isinstance(atom, Derivative):
+            return all(map(lambda v : v in variables, atom.variables))
+        if isinstance(atom, Integral):
+            return all(map(lambda l : len(l) == 3 or (len(l) == 1 and l[0] in variables),
+                atom.limits))
+        return False
 
     def args(self, raw_expr):
         def _args(expr):
@@ -165,12 +300,16 @@ class Parser:
         return symbols
 
     def parse(self, expr):
-        return parse_expr(expr, global_dict = self.__global_dict,
-            transformations = self.__transformations,
-            evaluate = False)
+        self.__resolve_names(set(Parser.NAME_PATTERN.findall(expr)))
+        code = stringify_expr(expr, {}, self.__global_dict, self.__transformations)
+        self.__resolve_names(set(Parser.NAME_PATTERN.findall(code)))
+        return eval_expr(compile(evaluateFalse(code), '<string>', 'eval'), {}, self.__global_dict)
     def parse_number(self, expr):
         for t in (list, tuple):
             if isinstance(expr, t): return t(map(self.parse_number, expr))
+        if isinstance(expr, str):
+            value = NumericEvaluator.evaluate(expr)
+            if value is not None: return value
         try:
             expr = self.parse(expr)
             expr = expr.evalf()
@@ -178,13 +317,89 @@ class Parser:
         except:
             return None
 
+    def solve(self, expr, sym):
+        key = SolveCache.key("solve", expr, sym, sy.S.Reals)
+        sol = self.__solve_cache.get(key)
+        if sol is None:
+            sol = sy.solve(expr, sym, domain = sy.S.Reals)
+            self.__solve_cache.put(key, sol)
+        return sol
     def solve_for(self, sym, expr):
+        key = SolveCache.key("solveset", expr, sym, sy.S.Reals)
+        ss = self.__solve_cache.get(key)
+        if ss is not None: return ss
         ss = sy.solveset(expr, sym, domain = sy.S.Reals)
         try:
             ss = list(ss)
         except:
             pass
+        self.__solve_cache.put(key, ss)
         return ss
+    def domain(self, expr, sym):
+        key = SolveCache.key("domain", expr, sym, sy.S.Reals)
+        dom = self.__solve_cache.get(key)
+        if dom is not None: return dom
+        if len(expr.atoms(TrigonometricFunction, *self.__invalid_atoms)) > 0 \
+            or len(expr.free_symbols - { sym }) > 0:
+            dom = sy.S.Reals
+        else:
+            try:
+                dom = continuous_domain(expr, sym, sy.S.Reals)
+                for f in expr.atoms(sy.asin, sy.acos):
+                    for r in (f.args[0] >= -1, f.args[0] <= 1):
+                        dom = dom.intersect(sy.solveset(r, sym, sy.S.Reals))
+            except NotImplementedError:
+                dom = sy.S.Reals
+        self.__solve_cache.put(key, dom)
+        return dom
+    def symmetry(self, expr, sym):
+        key = SolveCache.key("symmetry", expr, sym, sy.S.Reals)
+        sym_data = self.__solve_cache.get(key)
+        if sym_data is not None: return sym_data
+        expr = sy.sympify(expr)
+        period, parity = None, sy.S.Zero
+        if sym not in expr.free_symbols:
+            period, parity = sy.S.Zero, sy.S.One
+        elif len(expr.atoms(*self.__invalid_atoms)) == 0:
+            try:
+                period = sy.periodicity(expr, sym)
+            except Exception:
+                period = None
+            reflected = expr.xreplace({ sym : -sym })
+            if sy.simplify(reflected - expr) == 0:
+                parity = sy.S.One
+            elif sy.simplify(reflected + expr) == 0:
+                parity = sy.S.NegativeOne
+        sym_data = (period, parity)
+        self.__solve_cache.put(key, sym_data)
+        return sym_data
+    def is_radial(self, expr, x, y):
+        key = SolveCache.key("radial", expr, (x, y), sy.S.Reals)
+        radial = self.__solve_cache.get(key)
+        if radial is not None: return bool(radial)
+        expr = sy.sympify(expr)
+        radial = sy.false
+        if { x, y } <= expr.free_symbols and len(expr.atoms(*self.__invalid_atoms)) == 0:
+            profile = expr.xreplace({ x : sy.sqrt(x ** 2 + y ** 2), y : sy.S.Zero })
+            if sy.simplify(profile - expr) == 0: radial = sy.true
+        self.__solve_cache.put(key, radial)
+        return bool(radial)
+    def resolve(self, expr, timed):
+        if timed: expr = self.transform(expr)
+        if isinstance(expr, ConditionSet): expr = self.solve_for(expr.sym, expr.condition)
+        return expr
+
+    @staticmethod
+    def normalise(raw):
+        try:
+            tokens = tokenize.generate_tokens(io.StringIO(raw).readline)
+            ignored = (tokenize.NEWLINE, tokenize.NL, tokenize.INDENT,
+                tokenize.DEDENT, tokenize.ENDMARKER)
+            return " ".join(t.string for t in tokens if t.type not in ignored)
+        except (tokenize.TokenError, IndentationError, SyntaxError):
+            return raw.strip()
+    def get_parse_cache(self): return self.__parse_cache
+    def get_solve_cache(self): return self.__solve_cache
 
     def get_default_subs(self): return self.__default_subs
     def get_default_repl(self): return self.__default_repl
@@ -192,8 +407,19 @@ class Parser:
 
 class Binding:
 
+    SYMBOLIC_STATE = ('_Binding__name', '_Binding__body', '_Binding__dependencies',
+        '_Binding__parametric_lims', '_Binding__parameters', '_Binding__signature')
+    ANALYSIS_STATE = ('_Binding__symbols', '_Binding__valid', '_Binding__evaluable',
+        '_Binding__task')
+    RESULT_CACHE_SIZE = 64
+
+    __results = LRUCache(RESULT_CACHE_SIZE)
+
+    __walks = 0
+    __walks_avoided = 0
+
     def __init__(self, name, body, plot_type,
-        dep = None, eq = None, cl = None, pl = None, sig = None):
+        dep = None, eq = None, cl = None, pl = None, sig = None, pr = None):
         self.__name = name
         self.__body = body
         self.__plot_type = plot_type
@@ -202,9 +428,15 @@ class Binding:
         self.__equation = eq
         self.__colour = cl
         self.__parametric_lims = {} if pl is None else pl
+        self.__parameters = {} if pr is None else pr
 
         self.__signature = sig
+        self.__symbolic = True
 
+        self.__symbols = None
+        self.__valid = None
+        self.__evaluable = None
+        self.__task = None
         self.__check_body()
 
     def __check_body(self):
@@ -215,33 +447,95 @@ class Binding:
                 self.__body = self.__body[0]
         if not isinstance(self.__body, (sy.Expr, Relational, tuple, Tuple, list, Set)):
             raise ParsingError("Parsed.bind", "Invalid bind.")
+        self.__invalidate()
+
+    @staticmethod
+    def get_walk_stats():
+        return { "walks" : Binding.__walks, "avoided" : Binding.__walks_avoided }
+    def __invalidate(self):
+        self.__symbols = None
+        self.__valid = None
+        self.__evaluable = None
+    def __set_body(self, body):
+        if body is self.__body or body == self.__body: return
+        self.__body = body
+        self.__invalidate()
+    def __get_symbols(self):
+        if self.__symbols is None:
+            Binding.__walks += 1
+            self.__symbols = frozenset(Parser.get_instance().get_symbols(self.__body))
+        else:
+            Binding.__walks_avoided += 1
+        return self.__symbols
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for k in Binding.SYMBOLIC_STATE: state[k] = Serialiser.dumps(state[k])
+        for k in Binding.ANALYSIS_STATE: state[k] = None
+        return state
+    def __setstate__(self, state):
+        for k in Binding.SYMBOLIC_STATE: state[k] = Serialiser.loads(state[k])
+        self.__dict__.update(state)
+
+    def copy(self):
+        b = Binding(self.__name, self.__body, self.__plot_type,
+            set(self.__dependencies), self.__equation, self.__colour,
+            self.__parametric_lims, self.__signature, self.__parameters)
+        b.__symbols = self.__symbols
+        b.__valid = self.__valid
+        b.__evaluable = self.__evaluable
+        b.__symbolic = self.__symbolic
+        return b
 
     def split(self):
         if isinstance(self.__body, list):
             f = lambda b : Binding(self.__name, b,
                 self.__plot_type, self.__dependencies,
                 self.__equation, self.__colour,
-                self.__parametric_lims)
+                self.__parametric_lims, pr = self.__parameters)
             return [f(b) for b in self.__body]
         return [self]
     def get_signature(self):
-        return self if self.__signature is None else self.__signature
+        if self.__signature is not None: return self.__signature
+        body = tuple(self.__body) if isinstance(self.__body, list) else self.__body
+        lims = tuple(sorted(self.__parametric_lims.items(), key = lambda l : str(l[0])))
+        return (self.__name, self.__plot_type, body, lims)
 
     def label(self, t, text):
         if not self.__equation is None: self.__equation.label(t, text)
 
     def get_symbols(self):
-        return Parser.get_instance().get_symbols(self.get_body())
+        return set(self.__get_symbols())
     def get_xyz_symbols(self):
-        return Parser.get_instance().get_symbols(self.get_body(), Parser.FILTER_XYZ)
+        return set(filter(Parser.FILTER_XYZ, self.__get_symbols()))
     def get_tuv_symbols(self):
-        return Parser.get_instance().get_symbols(self.get_body(), Parser.FILTER_TUV)
+        return set(filter(Parser.FILTER_TUV, self.__get_symbols()))
     def get_free_symbols(self, historical = False):
-        fv = Parser.get_instance().get_symbols(self.get_body(), Parser.FILTER_NOT_RESERVED)
+        fv = set(filter(Parser.FILTER_NOT_RESERVED, self.__get_symbols()))
         return self.__dependencies.union(fv) if historical else fv
+    def get_unbound_symbols(self):
+        return set(filter(lambda s : s not in self.__parameters, self.get_free_symbols()))
     def get_dependencies(self):
         return self.__dependencies
 
+    def is_parameter(self):
+        if not self.binds_var() or Parser.get_instance().is_reserved(self.__name) \
+            or len(self.get_free_symbols(True)) > 0:
+            return False
+        return isinstance(self.__body, sy.Expr) and self.__body.is_number \
+            and self.__body.is_real is True
+    def get_value(self):
+        return float(self.__body)
+    def get_parameters(self):
+        return self.__parameters
+    def set_parameters(self, pr):
+        self.__parameters = pr
+    def get_parameter_symbols(self):
+        return tuple(sorted(filter(lambda s : s in self.__parameters, self.get_free_symbols()),
+            key = str))
+    def get_parameter_values(self):
+        return tuple(self.__parameters[s] for s in self.get_parameter_symbols())
+
     def binds_var(self):
         return isinstance(self.__name, Parser.VAR_TYPES)
     def binds_func(self):
@@ -250,26 +544,90 @@ class Binding:
     def __transform(self, func, tr, def_tr):
         fv = self.get_free_symbols()
         if tr is None: tr = def_tr
-        self.__body = getattr(Parser.get_instance(), func)(self.__body, tr)
+        self.__set_body(getattr(Parser.get_instance(), func)(self.__body, tr))
         for (d, _) in tr:
             if d in fv: self.__dependencies.add(d)
-        if isinstance(self.__body, ConditionSet):
-            self.__body = Parser.get_instance().solve_for(self.__body.sym, self.__body.condition)
+    def __request(self, timed):
+        if not timed and not isinstance(self.__body, ConditionSet): return
+        key = SolveCache.key("resolve", self.__body, timed, sy.S.Reals)
+        outcome = Binding.__results.get(key)
+        if outcome is not None: return self.__apply(timed, outcome)
+        task = Parser.submit("resolve", self.__body, timed,
+            budget = Parser.TRANSFORM_BUDGET if timed else None)
+        self.__task = (timed, key, task)
+        if task.is_done(): self.__finish()
+    def __finish(self):
+        (timed, key, task), self.__task = self.__task, None
+        try:
+            outcome = (True, Parser.result(task))
+        except Exception as e:
+            outcome = (False, str(e))
+        Binding.__results.put(key, outcome)
+        self.__apply(timed, outcome)
+    def __apply(self, timed, outcome):
+        success, result = outcome
+        if success:
+            self.__body = result
             self.__check_body()
+        elif timed:
+            self.__symbolic = False
+            self.__request(False)
+        else:
+            raise ParsingError("Binding.resolve", result)
+    def is_pending(self):
+        if self.__task is not None and self.__task[2].is_done():
+            try:
+                self.__finish()
+            except ParsingError:
+                pass
+        return self.__task is not None
+    def wait(self):
+        while self.is_pending(): self.__task[2].wait()
     def subs(self, sb = None):
         self.__transform('subs', sb, Parser.get_instance().get_default_subs())
     def replace(self, rp = None):
         self.__transform('replace', rp, Parser.get_instance().get_default_repl())
+    def substitute(self, sb):
+        self.__transform('substitute', sb, [])
     def transform(self, tr = None):
-        self.__transform('replace', tr, Parser.get_instance().get_default_trans())
+        timed = tr is None and not self.__is_valid_body()
+        if not timed:
+            self.__transform('transform', tr, Parser.get_instance().get_default_trans())
+        self.__request(timed and self.__symbolic)
     def default_ops(self):
         for f in [self.subs, self.replace, self.transform]: f()
-
+    def is_symbolic(self):
+        return self.__symbolic
+    def set_symbolic(self, symbolic):
+        self.__symbolic = symbolic
+
+    def __is_valid_body(self):
+        if self.__valid is None:
+            Binding.__walks += 1
+            self.__valid = Parser.get_instance().is_valid(self.__body)
+        else:
+            Binding.__walks_avoided += 1
+        return self.__valid
     def is_valid(self):
         if self.__plot_type not in PlotType.parametric() \
             and isinstance(self.__body, (tuple, Tuple)):
             return False
-        return Parser.get_instance().is_valid(self.__body)
+        if self.__is_valid_body(): return True
+        if self.__evaluable is None:
+            Binding.__walks += 1
+            self.__evaluable = Parser.get_instance().is_valid(self.__body,
+                self.get_sampling_symbols())
+        else:
+            Binding.__walks_avoided += 1
+        return self.__evaluable
+    def get_sampling_symbols(self):
+        if self.__plot_type in PlotType.parametric():
+            return tuple(sorted(self.get_tuv_symbols(), key = str))
+        if self.__plot_type == PlotType.LINE_2D:
+            return (Parser.X,)
+        if self.__plot_type == PlotType.SURFACE:
+            return (Parser.X, Parser.Y)
+        return ()
 
     def get_name(self):
         return self.__name
@@ -315,24 +673,78 @@ class Binding:
 
 class Parsed:
 
-    def __init__(self, raw):
+    def __init__(self, raw, cached = True, symbolic = True, blocking = True):
         self.__raw_expr = None
         self.__raw_args = None
         self.__raw_relation = None
         self.__is_parametric = False
 
         self.__raw = raw
+        self.__symbolic = symbolic
         self.__raw_binding = None
         self.__raw_error = None
 
         self.__binding = None
         self.__error = None
+        self.__task = None
+
+        if cached: self.__load()
+        if blocking: self.wait()
+        self.reset()
 
+    @staticmethod
+    def evaluate(raw, symbolic = True):
+        parsed = Parsed(raw, False, symbolic)
         try:
-            self.__eval()
+            parsed.__eval()
         except Exception as e:
-            self.__raw_error = str(e)
-        self.reset()
+            parsed.__raw_error = str(e)
+        state = list(parsed.__get_state())
+        state[0:2] = map(Serialiser.dumps, state[0:2])
+        return tuple(state)
+
+    def __load(self):
+        state = Parser.get_instance().get_parse_cache().get(Parser.normalise(self.__raw))
+        if state is not None:
+            self.__set_state(state)
+        elif len(self.__raw) == 0:
+            self.__raw_error = str(ParsingError("Parsed.eval_gather", "Nothing to parse."))
+        else:
+            self.__task = SymbolicWorker.submit(Parsed.evaluate, self.__raw, self.__symbolic)
+    def __finish(self):
+        task, self.__task = self.__task, None
+        try:
+            state = list(task.get_result())
+            state[0:2] = map(Serialiser.loads, state[0:2])
+        except (WorkerError, SerialiserError) as e:
+            names = Parser.NAME_PATTERN.findall(self.__raw)
+            if isinstance(e, WorkerError) and self.__symbolic \
+                and any(map(lambda n : n in names, Parser.CALCULUS_NAMES)):
+                self.__symbolic = False
+                self.__task = SymbolicWorker.submit(Parsed.evaluate, self.__raw, False)
+            else:
+                self.__raw_error = str(e)
+            return
+        state = tuple(state)
+        Parser.get_instance().get_parse_cache().put(Parser.normalise(self.__raw), state)
+        self.__set_state(state)
+
+    def is_pending(self):
+        if self.__task is not None and self.__task.is_done():
+            self.__finish()
+            self.reset()
+        return self.__task is not None
+    def wait(self):
+        while self.is_pending(): self.__task.wait()
+
+    def __get_state(self):
+        return (self.__raw_expr, self.__raw_args, self.__raw_relation, self.__is_parametric,
+            None if self.__raw_binding is None else self.__raw_binding.copy(),
+            self.__raw_error)
+    def __set_state(self, state):
+        (self.__raw_expr, self.__raw_args, self.__raw_relation, self.__is_parametric,
+            binding, self.__raw_error) = state
+        self.__raw_binding = None if binding is None else binding.copy()
 
     def __eval_gather(self):
         if len(self.__raw) == 0: raise ParsingError("Parsed.eval_gather", "Nothing to parse.")
@@ -445,7 +857,7 @@ class Parsed:
                     raise ParsingError("Parsed.eval_bind", "Cannot map to reserved variables.")
                 self.__bind(larg, rarg, None)
             elif Parser.Z in xyz:
-                sol = sy.solve(sy.Eq(larg, rarg), Parser.Z, domain = sy.S.Reals)
+                sol = parser.solve(sy.Eq(larg, rarg), Parser.Z)
                 if isinstance(sol, (list, tuple, Tuple)):
                     if len(sol) == 0:
                         raise ParsingError("Parsed.eval_bind", "No solutions.")
@@ -456,7 +868,7 @@ class Parsed:
                 else:
                     self.__bind(Parser.Z, sol, PlotType.SURFACE)
             elif Parser.Y in xyz:
-                sol = sy.solve(sy.Eq(larg, rarg), Parser.Y, domain = sy.S.Reals)
+                sol = parser.solve(sy.Eq(larg, rarg), Parser.Y)
                 if isinstance(sol, (list, tuple, Tuple)):
                     if len(sol) == 1:
                         self.__bind(Parser.Y, sol[0], PlotType.LINE_2D)
@@ -471,7 +883,9 @@ class Parsed:
         else:
             raise ParsingError("Parsed.eval_bind", "Unexpected argument structure.")
     def __eval_finish(self):
-        if not self.__raw_binding is None: self.__raw_binding.default_ops()
+        if self.__raw_binding is None: return
+        self.__raw_binding.set_symbolic(self.__symbolic)
+        self.__raw_binding.default_ops()
     def __eval(self):
         self.__eval_gather()
         self.__eval_structure()
@@ -481,7 +895,7 @@ class Parsed:
         self.__raw_binding = Binding(name, body, plot_type)
 
     def reset(self):
-        self.__binding = copy.copy(self.__raw_binding)
+        self.__binding = None if self.__raw_binding is None else self.__raw_binding.copy()
         self.__error = self.__raw_error
 
     def has_binding(self):
@@ -492,6 +906,10 @@ class Parsed:
         return self.__error is not None
     def get_error(self):
         return self.__error
+    def get_result(self):
+        return (self.__binding, self.__error)
+    def set_result(self, result):
+        self.__binding, self.__error = result
 
     def get_equation(self):
         if self.has_binding(): return self.get_binding().get_colour()
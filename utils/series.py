@@ -2,51 +2,116 @@ import math
 from abc import ABC, abstractmethod
 
 import numpy as np
-import numpy.ma as ma
 
+from matplotlib.colors import ListedColormap
 from matplotlib.collections import LineCollection
 from mpl_toolkits.mplot3d.art3d import Line3DCollection
 
 import sympy as sy
-from sympy.plotting.plot import _matplotlib_list, check_arguments, \
-    LineOver1DRangeSeries, SurfaceOver2DRangeSeries, \
-    Parametric2DLineSeries, Parametric3DLineSeries, ParametricSurfaceSeries
+from sympy.plotting.plot import _matplotlib_list
 from sympy.plotting.plot_implicit import ImplicitSeries
 from sympy.core.relational import (Equality, GreaterThan, LessThan, Relational)
 from sympy.logic.boolalg import BooleanFunction
 
 from utils.parsing import Parser
+from utils.cache import LRUCache
+from utils.buffers import SegmentBuffer
+from utils.contours import MarchingSquares
+from utils.kernels import KernelManager
 from utils.maths import PlotType
 
 class HelixSeries(ABC):
 
+    PARAMETRIC_POINTS = 300
+    PARAMETRIC_MESH_POINTS = 50
+    MIN_PERIOD_POINTS = 16
+    OPEN_SAMPLES = 8
+    TILE_POINTS = 32
+    TILE_MEMORY = 32 * 2 ** 20
+    CONTOUR_REFINEMENT = 4
+    CONTOUR_SPREAD = 1
+    RASTER_SCALE = 16
+    RASTER_TILE = 256
+    REFINEMENT_COARSENING = 2
+    REFINEMENT_BUDGET = 8
+    REFINEMENT_DEPTH = 10
+    REFINEMENT_TOLERANCE = 0.05
+    PYRAMID_LEVELS = 4
+    MIN_DETAIL = 2 ** -8
+    MAX_DETAIL = 2 ** 16
+
     def __init__(self, plot, detail):
         self._plot = plot
         self._data = []
         self._series = None
+        self._kernel = None
         self._min_x = None
         self._max_x = None
         self._min_y = None
         self._max_y = None
         self._min_z = None
         self._max_z = None
-        self._point_density = detail
+        self._point_density = HelixSeries.get_level(detail)
+        self._levels = LRUCache(HelixSeries.PYRAMID_LEVELS)
         self._is_parametric = False
+        self._is_adaptive = False
+        self._is_branched = isinstance(self._plot.get_body(), list)
+        self._domains = {}
+        self._symmetries = {}
+        self._radial = False
+        self._steps = []
+        self._found = None
+        self._task = None
+        self._period_line = None
+        self._tiles = LRUCache(HelixSeries.TILE_MEMORY, lambda z : z.nbytes)
+        self._segments = SegmentBuffer()
+        self._window = None
+        self._buffers = None
+        self._values = self._plot.get_parameter_values()
 
     @abstractmethod
     def draw(self, axis, xlim, ylim, zlim): pass
 
+    @staticmethod
+    def get_level(detail):
+        detail = min(max(detail, HelixSeries.MIN_DETAIL), HelixSeries.MAX_DETAIL)
+        return 2.0 ** round(math.log2(detail))
+    def get_detail(self):
+        return self._point_density
     def set_detail(self, detail):
-        self._data = []
-        self._min_x = None
-        self._max_x = None
-        self._min_y = None
-        self._max_y = None
-        self._min_z = None
-        self._max_z = None
-        self._point_density = detail
+        level = HelixSeries.get_level(detail)
+        if level == self._point_density: return
+        self._levels.put(self._point_density, self.__get_level())
+        state = self._levels.get(level)
+        self._levels.remove(level)
+        self._point_density = level
+        if state is None:
+            self.__reset_level()
+        else:
+            self.__set_level(state)
+    def __get_level(self):
+        return (self._data, self._segments, self._period_line,
+            self.__x(), self.__y(), self.__z())
+    def __set_level(self, state):
+        (self._data, self._segments, self._period_line,
+            (self._min_x, self._max_x), (self._min_y, self._max_y),
+            (self._min_z, self._max_z)) = state
+    def __reset_level(self):
+        self.__set_level(([], SegmentBuffer(), None, (None, None), (None, None), (None, None)))
+    def _clear(self):
+        self.__reset_level()
+        self._levels.clear()
+        self._tiles.clear()
+        self._window = None
+    def _update_parameters(self):
+        values = self._plot.get_parameter_values()
+        if values == self._values: return False
+        self._values = values
+        self._clear()
+        return True
 
     def _expand_data(self, xlim, ylim, zlim):
+        self._update_parameters()
         if self.__unbounded():
             self._generate_data(xlim, ylim, zlim)
             self._min_x, self._max_x = xlim
@@ -82,154 +147,306 @@ class HelixSeries(ABC):
     def __unbounded(self): return any([x is None for x in self.__x() + self.__y() + self.__z()])
 
     def get_plot(self): return self._plot
+    def set_plot(self, plot): self._plot = plot
     def get_signature(self): return self._plot.get_signature()
 
+    def _get_body(self):
+        return self._plot.get_body()
+    def _compile(self, args):
+        self._kernel = KernelManager.get_instance().get_kernel(
+            tuple(args) + self._plot.get_parameter_symbols(), self._get_body())
+        eq = self._plot.get_equation()
+        if eq is not None:
+            eq.report("Operations: %d -> %d" % self._kernel.get_op_counts())
+    def _evaluate(self, *args):
+        return self._kernel(*args, *self._values)
+    def _get_branches(self, values):
+        return values if self._is_branched else (values,)
+    def _analyse(self, syms):
+        self._steps = [(m, s) for s in syms for m in ("domain", "symmetry")]
+        if len(syms) == 2 and not (self._is_branched or self._is_parametric):
+            self._steps.append(("is_radial", None))
+        self._found = { "domain" : {}, "symmetry" : {}, "is_radial" : {} }
+        self.__submit()
+        self.is_pending()
+    def is_pending(self):
+        while self._task is not None and self._task.is_done():
+            self.__finish()
+        return self._task is not None
+    def __submit(self):
+        while len(self._steps) > 0:
+            request = self.__get_request(*self._steps[0])
+            if request is not None:
+                args, budget = request
+                self._task = Parser.submit(*args, budget = budget)
+                return
+            method, sym = self._steps.pop(0)
+            self._found[method][sym] = None
+        self._domains = dict((s, self.__get_intervals(d))
+            for (s, d) in self._found["domain"].items())
+        self._symmetries = dict((s, (None, 0) if d is None else (d[0], int(d[1])))
+            for (s, d) in self._found["symmetry"].items())
+        self._radial = bool(self._found["is_radial"].get(None, False))
+        self._found = None
+        self._clear()
+    def __finish(self):
+        (method, sym), task = self._steps.pop(0), self._task
+        self._task = None
+        try:
+            self._found[method][sym] = Parser.result(task)
+        except Exception:
+            self._found[method][sym] = None
+        self.__submit()
+    def __get_request(self, method, sym):
+        body = self._get_body()
+        if method == "domain":
+            if self._is_branched or len(self._plot.get_parameter_symbols()) > 0: return None
+            return (("domain", body, sym), Parser.DOMAIN_BUDGET)
+        if method == "symmetry":
+            if self._is_branched or self.__get_intervals(self._found["domain"][sym]) is not None:
+                return None
+            return (("symmetry", body, sym), Parser.SYMMETRY_BUDGET)
+        return (("is_radial", body, Parser.X, Parser.Y), Parser.SYMMETRY_BUDGET)
+    @staticmethod
+    def __get_intervals(domain):
+        if domain is None or domain == sy.S.Reals or len(domain.free_symbols) > 0: return None
+        intervals = []
+        for i in (domain.args if isinstance(domain, sy.Union) else (domain,)):
+            if isinstance(i, sy.Interval):
+                intervals.append((float(i.inf), float(i.sup), bool(i.left_open), bool(i.right_open)))
+            elif not isinstance(i, sy.FiniteSet):
+                return None
+        return intervals
+    def _get_domain(self, sym):
+        return self._domains.get(sym, None)
+    def _get_symmetry(self, sym):
+        period, parity = self._symmetries.get(sym, (None, 0))
+        if period is None: return (None, parity)
+        try:
+            period = float(period.subs(zip(self._plot.get_parameter_symbols(), self._values)))
+        except Exception:
+            return (None, parity)
+        if not math.isfinite(period) or period < 0 or \
+            0 < period * self._point_density < HelixSeries.MIN_PERIOD_POINTS:
+            return (None, parity)
+        return (period, parity)
+    def _is_symmetric(self, sym):
+        return self._get_symmetry(sym) != (None, 0)
+    def _is_radial(self):
+        return self._radial
+    def _get_step(self, sym):
+        period, _ = self._get_symmetry(sym)
+        step = 1 / self._point_density
+        if period: step = period / math.ceil(period / step)
+        return step
+    def _reduce(self, values, sym):
+        period, parity = self._get_symmetry(sym)
+        if period == 0: return (np.zeros_like(values), 1)
+        if period is not None:
+            step = self._get_step(sym)
+            return (np.rint(values / step) % round(period / step) * step, 1)
+        if parity == 0: return (values, 1)
+        return (np.abs(values), np.where(values < 0, parity, 1))
+    def _evaluate_reduced(self, xs, ys = None):
+        rx, px = self._reduce(xs, Parser.X)
+        ux, ix = np.unique(rx, return_inverse = True)
+        if ys is None: return px * self._evaluate(ux)[ix]
+        ry, py = self._reduce(ys, Parser.Y)
+        uy, iy = np.unique(ry, return_inverse = True)
+        values = self._evaluate(*np.meshgrid(ux, uy))
+        return np.outer(py * np.ones(len(ys)), px * np.ones(len(xs))) * values[iy][:, ix]
+    def _evaluate_radial(self, x, y):
+        r, index = np.unique(np.hypot(x, y), return_inverse = True)
+        return self._evaluate(r, np.zeros_like(r))[index].reshape(np.shape(x))
+    def _get_hull(self, sym):
+        domain = self._get_domain(sym)
+        if domain is None or len(domain) == 0: return domain
+        return [(min(d[0] for d in domain), max(d[1] for d in domain), False, False)]
+    def _get_samples(self, lim, n, domain):
+        if domain is None: return [np.linspace(*lim, n)] if n > 0 else []
+        pieces = []
+        for (lo, hi, lo_open, hi_open) in domain:
+            a, b = max(lo, lim[0]), min(hi, lim[1])
+            if b > a: pieces.append((a, b, lo_open and a == lo, hi_open and b == hi))
+        total = sum(b - a for (a, b, _, _) in pieces)
+        samples = []
+        for (a, b, a_open, b_open) in pieces:
+            s = np.linspace(a, b, max(2, math.ceil(n * (b - a) / total)))
+            inset = (s[1] - s[0]) * 2.0 ** -np.arange(HelixSeries.OPEN_SAMPLES, 0, -1)
+            s = s[int(a_open):len(s) - int(b_open)]
+            if a_open: s = np.concatenate((a + inset, s))
+            if b_open: s = np.concatenate((s, b - inset[::-1]))
+            samples.append(s)
+        return samples
+    def _get_segments(self, points):
+        points = np.column_stack(points)
+        return np.stack((points[:-1], points[1:]), axis = 1)
+    def _get_axis(self, lim, sym):
+        if self._is_symmetric(sym):
+            step = self._get_step(sym)
+            return np.arange(math.floor(lim[0] / step), math.ceil(lim[1] / step) + 1) * step
+        n = math.ceil((lim[1] - lim[0]) * self._point_density)
+        samples = self._get_samples(lim, n, self._get_hull(sym))
+        return samples[0] if len(samples) > 0 else np.empty(0)
+    def _get_meshes(self, xs, ys):
+        x, y = np.meshgrid(xs, ys)
+        if self._is_parametric: return self._evaluate(x, y)
+        if self._is_radial(): return (x, y, self._evaluate_radial(x, y))
+        if self._is_symmetric(Parser.X) or self._is_symmetric(Parser.Y):
+            return (x, y, self._evaluate_reduced(xs, ys))
+        values = self._evaluate(x, y)
+        return (x, y, np.stack(values) if self._is_branched else values)
+
+    def _sample_line(self, x):
+        return np.atleast_2d(np.array(self._get_branches(self._evaluate(x))))
+    def _refine(self, x, v):
+        if not self._is_adaptive: return (x, v)
+        budget = math.ceil(len(x) * HelixSeries.REFINEMENT_BUDGET)
+        tolerance = HelixSeries.REFINEMENT_TOLERANCE / self._point_density
+        candidates = np.arange(len(x) - 1)
+        for _ in range(HelixSeries.REFINEMENT_DEPTH):
+            candidates = np.sort(candidates[:budget])
+            if len(candidates) == 0: break
+            mid = (x[candidates] + x[candidates + 1]) / 2
+            vm = self._sample_line(mid)
+            budget -= len(mid)
+            a, b = v[:, candidates], v[:, candidates + 1]
+            finite = np.isfinite(np.stack((a, b, vm)))
+            with np.errstate(invalid = 'ignore'):
+                error = np.abs(vm - (a + b) / 2)
+            error = np.where(finite.all(axis = 0), error,
+                np.where(finite.any(axis = 0), np.inf, 0)).max(axis = 0)
+            keep = np.flatnonzero(error > tolerance)
+            x = np.insert(x, candidates[keep] + 1, mid[keep])
+            v = np.insert(v, candidates[keep] + 1, vm[:, keep], axis = 1)
+            positions = candidates[keep] + 1 + np.arange(len(keep))
+            candidates = np.stack((positions - 1, positions), axis = 1).ravel()
+            candidates = candidates[np.argsort(-np.repeat(error[keep], 2), kind = 'stable')]
+        return (x, v)
+    def _get_symmetric_line(self, xlim):
+        x = self._get_axis(xlim, Parser.X)
+        period, parity = self._get_symmetry(Parser.X)
+        if period == 0 or len(x) < 2 or not self._is_adaptive:
+            return (x, np.atleast_2d(self._evaluate_reduced(x)))
+        if period is None:
+            u = np.unique(np.abs(x))
+            u, v = self._refine(u, self._sample_line(u))
+            xs = np.concatenate((-u[u > 0][::-1], u))
+            vs = np.concatenate((parity * v[:, u > 0][:, ::-1], v), axis = 1)
+        else:
+            if self._period_line is None:
+                step = self._get_step(Parser.X)
+                u = np.arange(round(period / step) + 1) * step
+                self._period_line = self._refine(u, self._sample_line(u))
+            u, v = self._period_line
+            j = np.arange(math.floor(x[0] / period), math.ceil(x[-1] / period))
+            xs = np.append((u[:-1] + period * j[:, None]).ravel(), u[-1] + period * j[-1])
+            vs = np.append(np.tile(v[:, :-1], len(j)), v[:, -1:], axis = 1)
+        inside = (xs >= x[0]) & (xs <= x[-1])
+        return (xs[inside], vs[:, inside])
+
     def _expand_line(self, xlim):
-        self._series.start, self._series.end = xlim
-        self._series.nb_of_points = math.ceil((xlim[1] - xlim[0]) * self._point_density)
+        n = math.ceil((xlim[1] - xlim[0]) * self._point_density)
+        if self._is_adaptive: n = math.ceil(n / HelixSeries.REFINEMENT_COARSENING)
+        if self._is_symmetric(Parser.X):
+            lines = [self._get_symmetric_line(xlim)]
+        else:
+            lines = [self._refine(x, self._sample_line(x))
+                for x in self._get_samples(xlim, n, self._get_domain(Parser.X))]
+        segments = np.concatenate([np.empty((0, 2, 2))] + [self._get_segments((x, values))
+            for (x, v) in lines for values in v if len(x) > 1])
         if self.__unbounded():
-            self._data = self._series.get_segments()
+            self._segments.clear()
+            self._segments.append(segments)
         else:
             prepend = xlim[0] < self._min_x
             append = xlim[1] > self._max_x
             assert len([x for x in [prepend, append] if x]) < 2
-            segments = self._series.get_segments()
             if prepend:
-                self._data.extend(segments)
+                self._segments.prepend(segments)
             if append:
-                segments.extend(self._data)
-                self._data = segments
+                self._segments.append(segments)
     def _get_line(self, xlim, ylim):
-        def p_check(v):
-            return v[0] >= xlim[0] and v[0] <= xlim[1] \
-                and v[1] >= ylim[0] and v[1] <= ylim[1]
-        d = [v for v in self._data if p_check(v[0]) or p_check(v[1])]
+        d = self._segments.query(xlim, ylim)
         return None if len(d) == 0 else d
 
-    def _safe_get_mesh(self):
-        x, y, z = self._series.get_meshes()
-        nx = ny = "nb_of_points_"
-        if self._is_parametric:
-            nx += 'u'
-            ny += 'v'
-        else:
-            nx += 'x'
-            ny += 'y'
-        if not x.shape:
-            x = x.max() * ma.ones((getattr(self._series, ny), getattr(self._series, nx)))
-        if not y.shape:
-            y = y.max() * ma.ones((getattr(self._series, ny), getattr(self._series, nx)))
-        if not z.shape:
-            z = z.max() * ma.ones((getattr(self._series, ny), getattr(self._series, nx)))
-        return x, y, z
-    def _expand_mesh(self, xlim, ylim):
-        sx, ex, nx = "start_", "end_", "nb_of_points_"
-        if self._is_parametric:
-            x, y = 'u', 'v'
-        else:
-            x, y = 'x', 'y'
-        sy_, ey, ny = sx + y, ex + y, nx + y
-        sx, ex, nx = sx + x, ex + x, nx + x
-
-        setattr(self._series, sx, xlim[0])
-        setattr(self._series, ex, xlim[1])
-        setattr(self._series, sy_, ylim[0])
-        setattr(self._series, ey, ylim[1])
-
-        xp = math.ceil((xlim[1] - xlim[0]) * self._point_density)
-        yp = math.ceil((ylim[1] - ylim[0]) * self._point_density)
-
-        if self.__unbounded():
-            if xp < 2 or yp < 2: return
-            setattr(self._series, nx, xp)
-            setattr(self._series, ny, yp)
-            self._data = self._safe_get_mesh()
-        else:
-            prepend_x = xlim[0] < self._min_x
-            append_x = xlim[1] > self._max_x
-            prepend_y = ylim[0] < self._min_y
-            append_y = ylim[1] > self._max_y
-            assert len([x for x in [prepend_x, append_x, prepend_y, append_y] if x]) == 1
-            if prepend_x or append_x:
-                if xp == 0: return
-                setattr(self._series, nx, xp)
-                setattr(self._series, ny, len(self._data[1]))
-                x, y, z = self._safe_get_mesh()
-                if prepend_x:
-                    x = np.concatenate((x, self._data[0]), axis = 1)
-                    y = np.concatenate((y, self._data[1]), axis = 1)
-                    z = ma.concatenate((z, self._data[2]), axis = 1)
-                if append_x:
-                    x = np.concatenate((self._data[0], x), axis = 1)
-                    y = np.concatenate((self._data[1], y), axis = 1)
-                    z = ma.concatenate((self._data[2], z), axis = 1)
-            if prepend_y or append_y:
-                if yp == 0: return
-                setattr(self._series, nx, len(self._data[0][0]))
-                setattr(self._series, ny, yp)
-                x, y, z = self._safe_get_mesh()
-                if prepend_y:
-                    x = np.concatenate((x, self._data[0]), axis = 0)
-                    y = np.concatenate((y, self._data[1]), axis = 0)
-                    z = ma.concatenate((z, self._data[2]), axis = 0)
-                if append_y:
-                    x = np.concatenate((self._data[0], x), axis = 0)
-                    y = np.concatenate((self._data[1], y), axis = 0)
-                    z = ma.concatenate((self._data[2], z), axis = 0)
-            self._data = (x, y, z)
+    def _get_range(self, lim, sym):
+        hull = self._get_hull(sym)
+        if hull is not None:
+            if len(hull) == 0: return None
+            lim = (max(lim[0], hull[0][0]), min(lim[1], hull[0][1]))
+            if lim[0] >= lim[1]: return None
+        step = self._get_step(sym)
+        return (math.floor(lim[0] / step), math.ceil(lim[1] / step) + 1)
+    def _get_coords(self, start, stop, sym):
+        coords = np.arange(start, stop) * self._get_step(sym)
+        hull = self._get_hull(sym)
+        return coords if hull is None else np.clip(coords, hull[0][0], hull[0][1])
+    def _get_tile(self, i, j):
+        n = HelixSeries.TILE_POINTS
+        key = (i, j, self._get_step(Parser.X), self._get_step(Parser.Y))
+        z = self._tiles.get(key)
+        if z is None:
+            z = self._get_meshes(self._get_coords(i * n, (i + 1) * n, Parser.X),
+                self._get_coords(j * n, (j + 1) * n, Parser.Y))[2]
+            self._tiles.put(key, z)
+        return z
+    def _get_window(self, xlim, ylim):
+        rx, ry = self._get_range(xlim, Parser.X), self._get_range(ylim, Parser.Y)
+        if rx is None or ry is None or rx[1] - rx[0] < 2 or ry[1] - ry[0] < 2: return None
+        key = (rx, ry, self._get_step(Parser.X), self._get_step(Parser.Y))
+        if self._window is not None and self._window[0] == key: return self._window[1]
+        n = HelixSeries.TILE_POINTS
+        ix = range(rx[0] // n, (rx[1] - 1) // n + 1)
+        iy = range(ry[0] // n, (ry[1] - 1) // n + 1)
+        z = np.concatenate([np.concatenate([self._get_tile(i, j) for i in ix], axis = -1)
+            for j in iy], axis = -2)
+        z = z[..., ry[0] - iy[0] * n:ry[1] - iy[0] * n, rx[0] - ix[0] * n:rx[1] - ix[0] * n]
+        x, y = np.meshgrid(self._get_coords(*rx, Parser.X), self._get_coords(*ry, Parser.Y))
+        if self._buffers is None or self._buffers[0].shape != z.shape:
+            self._buffers = (np.empty(z.shape), np.empty(z.shape), np.empty(z.shape),
+                np.empty(z.shape, dtype = bool))
+        self._window = (key, (x, y, z))
+        return self._window[1]
     def _get_mesh(self, xlim, ylim, zlim):
-        try:
-            (x, y, z) = self._data
-        except:
-            return None
-
-        xi = [i for i, v in enumerate(x[0]) if v >= xlim[0] and v <= xlim[1]]
-        yi = [i for i, v in enumerate(y) if v[0] >= ylim[0] and v[0] <= ylim[1]]
-        if len(xi) < 2 or len(yi) < 2: return None
-        if xi[-1] < len(x[0]): xi[-1] += 1
-        if yi[-1] < len(y): yi[-1] += 1
-        if xi[-1] - xi[0] < 2 or yi[-1] - yi[0] < 2:
-            return None
-
-        x = x[yi[0]:yi[-1], xi[0]:xi[-1]]
-        y = y[yi[0]:yi[-1], xi[0]:xi[-1]]
-        z = z[yi[0]:yi[-1], xi[0]:xi[-1]]
-
+        window = self._get_window(xlim, ylim)
+        if window is None: return None
+        x, y, z = window
+        xo, yo, zo, mask = self._buffers
         diff = (zlim[1] - zlim[0]) / 5
-        cond = (z >= zlim[0] - diff) & (z <= zlim[1] + diff)
-        x = np.where(cond, x, np.nan)
-        y = np.where(cond, y, np.nan)
-        z = np.where(cond, z, np.nan)
-        if any(map(lambda d : len(d) == 0, (x, y, z))):
-            return None
-        return (x, y, z)
+        with np.errstate(invalid = 'ignore'):
+            np.subtract(z, (zlim[0] + zlim[1]) / 2, out = zo)
+            np.abs(zo, out = zo)
+            np.less_equal(zo, (zlim[1] - zlim[0]) / 2 + diff, out = mask)
+        for (src, out) in ((x, xo), (y, yo), (z, zo)):
+            out.fill(np.nan)
+            np.copyto(out, src, where = mask)
+        return (xo, yo, zo)
 
     @staticmethod
     def generate_series(plot, detail):
         pt = plot.get_plot_type()
-        try:
-            if pt == PlotType.LINE_2D:
-                return Line2DPlot(plot, detail)
-            elif pt == PlotType.PARAMETRIC_2D:
-                return Parametric2DPlot(plot, detail)
-            elif pt == PlotType.IMPLICIT_2D:
-                return Implicit2DPlot(plot, detail)
-            elif pt == PlotType.SURFACE:
-                return SurfacePlot(plot, detail)
-            elif pt == PlotType.PARAMETRIC_3D:
-                return Parametric3DLinePlot(plot, detail)
-            elif pt == PlotType.PARAMETRIC_SURFACE:
-                return ParametricSurfacePlot(plot, detail)
-        except:
-            return None
+        if pt == PlotType.LINE_2D:
+            return Line2DPlot(plot, detail)
+        elif pt == PlotType.PARAMETRIC_2D:
+            return Parametric2DPlot(plot, detail)
+        elif pt == PlotType.IMPLICIT_2D:
+            return Implicit2DPlot(plot, detail)
+        elif pt == PlotType.SURFACE:
+            return SurfacePlot(plot, detail)
+        elif pt == PlotType.PARAMETRIC_3D:
+            return Parametric3DLinePlot(plot, detail)
+        elif pt == PlotType.PARAMETRIC_SURFACE:
+            return ParametricSurfacePlot(plot, detail)
         raise ValueError("Unexpected plot type.")
 
 class Line2DPlot(HelixSeries):
 
     def __init__(self, plot, detail):
         super().__init__(plot, detail)
-        check = check_arguments([self._plot.get_body()], 1, 1)[0]
-        self._series = LineOver1DRangeSeries(*check)
+        self._is_adaptive = True
+        self._compile((Parser.X,))
+        self._analyse((Parser.X,))
 
     def _generate_data(self, xlim, ylim, zlim):
         if self._dx(xlim): self._expand_line(xlim)
@@ -246,12 +463,14 @@ class Parametric2DPlot(HelixSeries):
     def __init__(self, plot, detail):
         super().__init__(plot, detail)
         self._is_parametric = True
-        self._series = Parametric2DLineSeries(*(check_arguments(self._plot.get_body(), 2, 1)[0]))
+        self._var = sorted(self._plot.get_tuv_symbols(), key = str)[0]
+        self._compile((self._var,))
 
     def draw(self, axis, xlim, ylim, zlim):
-        tlim = self._plot.get_parametric_limits()[self._series.var]
-        self._series.start, self._series.end = tlim
-        axis.add_collection(LineCollection(self._series.get_segments(),
+        self._update_parameters()
+        tlim = self._plot.get_parametric_limits()[self._var]
+        t = np.linspace(*tlim, HelixSeries.PARAMETRIC_POINTS)
+        axis.add_collection(LineCollection(self._get_segments(self._evaluate(t)),
             colors = self._plot.get_colour()))
 
 class Implicit2DPlot(HelixSeries):
@@ -280,12 +499,94 @@ class Implicit2DPlot(HelixSeries):
         elif isinstance(expr, (Equality, GreaterThan, LessThan)):
             has_equality = True
 
+        self._expr = expr
+        self._has_equality = has_equality
+        self._function = None
+        self._region = None
+        if isinstance(expr, Equality):
+            self._function = expr.lhs - expr.rhs
+            self._compile((Parser.X, Parser.Y))
+            self._analyse((Parser.X, Parser.Y))
+        elif len(expr.atoms(Equality)) == 0:
+            self._region = expr
+            self._compile((Parser.X, Parser.Y))
+        else:
+            self._build_series()
+
+    def _get_body(self):
+        if self._function is not None: return self._function
+        if self._region is not None: return self._region
+        return self._plot.get_body()
+    def _get_contour_tile(self, i, j):
+        n = HelixSeries.TILE_POINTS
+        key = (i, j, self._get_step(Parser.X), self._get_step(Parser.Y))
+        segments = self._tiles.get(key)
+        if segments is None:
+            xs = self._get_coords(i * n, (i + 1) * n + 1, Parser.X)
+            ys = self._get_coords(j * n, (j + 1) * n + 1, Parser.Y)
+            segments = self._get_contour_segments(xs, ys, self._get_meshes(xs, ys)[2])
+            self._tiles.put(key, segments)
+        return segments
+    def _get_contour_segments(self, xs, ys, v):
+        _, j, i = MarchingSquares.get_cells(v[None], HelixSeries.CONTOUR_SPREAD)
+        t = np.linspace(0, 1, HelixSeries.CONTOUR_REFINEMENT + 1)
+        sx = xs[i, None] + (xs[i + 1] - xs[i])[:, None] * t
+        sy = ys[j, None] + (ys[j + 1] - ys[j])[:, None] * t
+        segments, scale = MarchingSquares.get_segments(sx, sy,
+            self._evaluate(sx[:, None, :], sy[:, :, None]))
+        if len(segments) == 0: return segments
+        mid = segments.mean(axis = 1)
+        with np.errstate(invalid = 'ignore'):
+            return segments[np.abs(self._evaluate(mid[:, 0], mid[:, 1])) <= scale]
+    def _get_contour(self, xlim, ylim):
+        rx, ry = self._get_range(xlim, Parser.X), self._get_range(ylim, Parser.Y)
+        if rx is None or ry is None: return None
+        n = HelixSeries.TILE_POINTS
+        segments = [self._get_contour_tile(i, j)
+            for i in range(rx[0] // n, (rx[1] - 1) // n + 1)
+            for j in range(ry[0] // n, (ry[1] - 1) // n + 1)]
+        segments = np.concatenate([np.empty((0, 2, 2))] + segments)
+        return None if len(segments) == 0 else segments
+    def _get_raster_tile(self, i, j, step):
+        n = HelixSeries.RASTER_TILE
+        key = (i, j, step)
+        mask = self._tiles.get(key)
+        if mask is None:
+            xs, ys = np.arange(i * n, (i + 1) * n) * step, np.arange(j * n, (j + 1) * n) * step
+            with np.errstate(invalid = 'ignore'):
+                mask = self._evaluate(xs[None, :], ys[:, None]) > 0.5
+            self._tiles.put(key, mask)
+        return mask
+    def _get_raster(self, xlim, ylim):
+        step = 1 / (self._point_density * HelixSeries.RASTER_SCALE)
+        rx = (math.floor(xlim[0] / step), math.ceil(xlim[1] / step) + 1)
+        ry = (math.floor(ylim[0] / step), math.ceil(ylim[1] / step) + 1)
+        key = (rx, ry, step)
+        if self._window is not None and self._window[0] == key: return self._window[1]
+        n = HelixSeries.RASTER_TILE
+        ix = range(rx[0] // n, (rx[1] - 1) // n + 1)
+        iy = range(ry[0] // n, (ry[1] - 1) // n + 1)
+        mask = np.concatenate([np.concatenate([self._get_raster_tile(i, j, step) for i in ix],
+            axis = 1) for j in iy], axis = 0)
+        mask = mask[ry[0] - iy[0] * n:ry[1] - iy[0] * n, rx[0] - ix[0] * n:rx[1] - ix[0] * n]
+        extent = ((rx[0] - 0.5) * step, (rx[1] - 0.5) * step,
+            (ry[0] - 0.5) * step, (ry[1] - 0.5) * step)
+        self._window = (key, (mask, extent))
+        return self._window[1]
+
+    def _build_series(self):
         x = (Parser.X, -10, 10)
         y = (Parser.Y, -10, 10)
-        self._series = ImplicitSeries(expr, x, y, has_equality,
+        subs = dict(zip(self._plot.get_parameter_symbols(), self._values))
+        self._series = ImplicitSeries(self._expr.subs(subs), x, y, self._has_equality,
             True, 0, 300, self._plot.get_colour())
+    def _update_parameters(self):
+        if not super()._update_parameters(): return False
+        if self._series is not None: self._build_series()
+        return True
 
-    def set_detail(self, detail): pass
+    def set_detail(self, detail):
+        if self._series is None: super().set_detail(detail)
     def _generate_data(self, xlim, ylim, zlim):
         if self._dx(xlim) or self._dy(ylim):
             self._series.start_x, self._series.end_x = xlim
@@ -293,39 +594,52 @@ class Implicit2DPlot(HelixSeries):
             self._data.extend(_matplotlib_list(self._series.get_raster()[0]))
 
     def draw(self, axis, xlim, ylim, zlim):
-        self._expand_data(xlim, ylim, zlim)
-        axis.fill(*self._data, facecolor = self._plot.get_colour())
+        if self._series is not None:
+            self._expand_data(xlim, ylim, zlim)
+            axis.fill(*self._data, facecolor = self._plot.get_colour())
+            return
+        self._update_parameters()
+        if self._region is not None:
+            mask, extent = self._get_raster(xlim, ylim)
+            axis.imshow(mask, extent = extent, origin = 'lower', aspect = 'auto',
+                interpolation = 'nearest', vmin = 0, vmax = 1,
+                cmap = ListedColormap([(0, 0, 0, 0), self._plot.get_colour()]))
+            return
+        d = self._get_contour(xlim, ylim)
+        if d is None: return
+        axis.add_collection(LineCollection(d, colors = self._plot.get_colour()))
 
 class SurfacePlot(HelixSeries):
 
     def __init__(self, plot, detail):
         super().__init__(plot, detail)
-        self._series = SurfaceOver2DRangeSeries(*check_arguments([self._plot.get_body()], 1, 2)[0])
-
-    def _generate_data(self, xlim, ylim, zlim):
-        if self._dx(xlim) or self._dy(ylim): self._expand_mesh(xlim, ylim)
+        self._compile((Parser.X, Parser.Y))
+        self._analyse((Parser.X, Parser.Y))
 
     def draw(self, axis, xlim, ylim, zlim):
-        self._expand_data(xlim, ylim, zlim)
+        self._update_parameters()
         d = self._get_mesh(xlim, ylim, zlim)
         if d is None: return
-        if self._plot.get_equation().is_contoured():
-            axis.contour(*d, colors = [self._plot.get_colour()])
-        else:
-            axis.plot_surface(*d, color = self._plot.get_colour(),
-                rstride = 1, cstride = 1, linewidth = 0.1)
+        for mesh in (zip(*d) if self._is_branched else [d]):
+            if self._plot.get_equation().is_contoured():
+                axis.contour(*mesh, colors = [self._plot.get_colour()])
+            else:
+                axis.plot_surface(*mesh, color = self._plot.get_colour(),
+                    rstride = 1, cstride = 1, linewidth = 0.1)
 
 class Parametric3DLinePlot(HelixSeries):
 
     def __init__(self, plot, detail):
         super().__init__(plot, detail)
         self._is_parametric = True
-        self._series = Parametric3DLineSeries(*check_arguments(self._plot.get_body(), 3, 1)[0])
+        self._var = sorted(self._plot.get_tuv_symbols(), key = str)[0]
+        self._compile((self._var,))
 
     def draw(self, axis, xlim, ylim, zlim):
-        tlim = self._plot.get_parametric_limits()[self._series.var]
-        self._series.start, self._series.end = tlim
-        axis.add_collection(Line3DCollection(self._series.get_segments(),
+        self._update_parameters()
+        tlim = self._plot.get_parametric_limits()[self._var]
+        t = np.linspace(*tlim, HelixSeries.PARAMETRIC_POINTS)
+        axis.add_collection(Line3DCollection(self._get_segments(self._evaluate(t)),
             colors = self._plot.get_colour()))
 
 class ParametricSurfacePlot(HelixSeries):
@@ -333,17 +647,15 @@ class ParametricSurfacePlot(HelixSeries):
     def __init__(self, plot, detail):
         super().__init__(plot, detail)
         self._is_parametric = True
-        self._series = ParametricSurfaceSeries(*check_arguments(self._plot.get_body(), 3, 2)[0])
-
-    def _generate_data(self, xlim, ylim, zlim):
-        if self._dx(xlim) or self._dy(ylim): self._expand_mesh(xlim, ylim)
+        self._var_u, self._var_v = sorted(self._plot.get_tuv_symbols(), key = str)
+        self._compile((self._var_u, self._var_v))
 
     def draw(self, axis, xlim, ylim, zlim):
-        ulim = self._plot.get_parametric_limits()[self._series.var_u]
-        vlim = self._plot.get_parametric_limits()[self._series.var_v]
-        self._series.start_u, self._series.end_u = ulim
-        self._series.start_v, self._series.end_v = vlim
-        mesh = self._safe_get_mesh()
+        self._update_parameters()
+        ulim = self._plot.get_parametric_limits()[self._var_u]
+        vlim = self._plot.get_parametric_limits()[self._var_v]
+        n = HelixSeries.PARAMETRIC_MESH_POINTS
+        mesh = self._get_meshes(np.linspace(*ulim, n), np.linspace(*vlim, n))
         if self._plot.get_equation().is_contoured():
             axis.contour(*mesh, colors = [self._plot.get_colour()])
         else:
@@ -0,0 +1,198 @@
+import signal
+import threading
+import multiprocessing as mp
+
+class WorkerError(Exception):
+
+    def __init__(self, m):
+        self.__message = m
+        super().__init__(self.__str__())
+
+    def __str__(self):
+        return str(self.__message)
+
+def limit(func, args, budget, interval = 0.05):
+    if budget is None: return func(*args)
+    if hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread():
+        def expire(_signum, _frame):
+            raise WorkerError("Timed out after " + str(budget) + "s.")
+        handler = signal.signal(signal.SIGALRM, expire)
+        signal.setitimer(signal.ITIMER_REAL, budget, interval)
+        try:
+            return func(*args)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, handler)
+    outcome = []
+    def run():
+        try:
+            outcome.append((True, func(*args)))
+        except Exception as e:
+            outcome.append((False, e))
+    thread = threading.Thread(target = run, daemon = True)
+    thread.start()
+    thread.join(budget)
+    if len(outcome) == 0: raise WorkerError("Timed out after " + str(budget) + "s.")
+    success, result = outcome[0]
+    if not success: raise result
+    return result
+
+def serve(connection):
+    from utils.files import FileManager
+    from utils.parsing import Parser
+    FileManager()
+    Parser()
+    connection.send(None)
+    while True:
+        try:
+            func, args = connection.recv()
+        except (EOFError, OSError):
+            break
+        try:
+            result = (True, func(*args))
+        except Exception as e:
+            result = (False, str(e))
+        try:
+            connection.send(result)
+        except Exception as e:
+            connection.send((False, str(e)))
+
+class WorkerTask:
+
+    def __init__(self, func, args, budget = None):
+        self.__func = func
+        self.__args = args
+        self.__outcome = None
+        self.__thread = None
+        worker = SymbolicWorker.get_worker()
+        if worker is None or not worker.is_available():
+            self.__run(None, budget)
+        else:
+            self.__thread = threading.Thread(target = self.__run,
+                args = (worker, budget), daemon = True)
+            self.__thread.start()
+
+    def __run(self, worker, budget):
+        try:
+            if worker is None:
+                self.__outcome = (True, limit(self.__func, self.__args, budget))
+            else:
+                self.__outcome = (True, worker.run(self.__func, *self.__args,
+                    budget = budget, startup = SymbolicWorker.STARTUP_TIMEOUT))
+        except Exception as e:
+            self.__outcome = (False, e)
+
+    def is_done(self):
+        return self.__outcome is not None
+    def wait(self):
+        if self.__thread is not None: self.__thread.join()
+    def get_result(self):
+        self.wait()
+        success, result = self.__outcome
+        if not success: raise result
+        return result
+
+class SymbolicWorker:
+
+    __instance = None
+
+    BUDGET = 5.0
+    STARTUP_TIMEOUT = 60.0
+
+    @staticmethod
+    def get_instance():
+        if SymbolicWorker.__instance is None:
+            raise Exception("No instance of SymbolicWorker.")
+        return SymbolicWorker.__instance
+
+    @staticmethod
+    def get_worker():
+        return SymbolicWorker.__instance
+    @staticmethod
+    def call(func, *args, budget = None):
+        if SymbolicWorker.__instance is None:
+            return func(*args)
+        return SymbolicWorker.__instance.run(func, *args, budget = budget)
+    @staticmethod
+    def submit(func, *args, budget = None):
+        return WorkerTask(func, args, budget)
+
+    def __init__(self, budget = BUDGET):
+        if SymbolicWorker.__instance is not None:
+            raise Exception("Invalid initialistion of SymbolicWorker.")
+        SymbolicWorker.__instance = self
+        self.__budget = budget
+        self.__context = mp.get_context("spawn")
+        self.__process = None
+        self.__connection = None
+        self.__ready = False
+        self.__available = True
+        self.__lock = threading.Lock()
+        self.__start()
+
+    def __start(self):
+        try:
+            parent, child = self.__context.Pipe()
+            self.__process = self.__context.Process(target = serve,
+                args = (child,), daemon = True)
+            self.__process.start()
+            child.close()
+            self.__connection = parent
+            self.__ready = False
+        except Exception:
+            self.__available = False
+    def __wait_ready(self, timeout):
+        if self.__ready: return True
+        if self.__connection.poll(timeout):
+            self.__connection.recv()
+            self.__ready = True
+        return self.__ready
+    def stop(self):
+        if self.__process is not None:
+            self.__process.terminate()
+            self.__process.join()
+        if self.__connection is not None:
+            self.__connection.close()
+        self.__process = None
+        self.__connection = None
+        self.__ready = False
+    def restart(self):
+        self.stop()
+        self.__start()
+
+    def run(self, func, *args, budget = None, startup = None):
+        if budget is None: budget = self.__budget
+        if startup is None: startup = budget
+        if not self.__lock.acquire(timeout = max(budget, startup)):
+            raise WorkerError("Worker busy for " + str(max(budget, startup)) + "s.")
+        try:
+            return self.__run(func, args, budget, startup)
+        finally:
+            self.__lock.release()
+    def __run(self, func, args, budget, startup):
+        if self.__available and (self.__process is None or not self.__process.is_alive()):
+            self.restart()
+        if not self.__available:
+            return func(*args)
+        if not self.__wait_ready(startup):
+            raise WorkerError("Worker not ready after " + str(startup) + "s.")
+        self.__connection.send((func, args))
+        if not self.__connection.poll(budget):
+            self.restart()
+            raise WorkerError("Timed out after " + str(budget) + "s.")
+        try:
+            success, result = self.__connection.recv()
+        except (EOFError, OSError) as e:
+            self.restart()
+            raise WorkerError("Worker failed.") from e
+        except Exception as e:
+            raise WorkerError(e) from e
+        if not success: raise WorkerError(result)
+        return result
+
+    def is_available(self):
+        return self.__available
+    def get_budget(self):
+        return self.__budget
+    def set_budget(self, budget):
+        self.__budget = budget